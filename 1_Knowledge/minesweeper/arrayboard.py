@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+import scipy.ndimage
+
+from minesweeper import Minesweeper
+
+# Kernel counting the eight cells around a cell, excluding the cell itself
+NEIGHBORS = np.array([
+    [1, 1, 1],
+    [1, 0, 1],
+    [1, 1, 1]
+])
+
+
+class ArrayMinesweeper(Minesweeper):
+    """
+    Minesweeper game representation backed by NumPy arrays.
+    Neighbor counts are computed once when the board is created,
+    so `nearby_mines` is a single array lookup.
+    """
+
+    def __init__(self, height=8, width=8, mines=8):
+
+        # Set initial width, height, and number of mines
+        self.height = height
+        self.width = width
+
+        # Add mines randomly, sampling distinct cells by flat index
+        flat = np.zeros(height * width, dtype=bool)
+        flat[random.sample(range(height * width), mines)] = True
+        self.board = flat.reshape(height, width)
+        self.mines = set(
+            (int(i), int(j)) for i, j in zip(*np.nonzero(self.board))
+        )
+
+        # Count neighboring mines for every cell in one convolution
+        self.counts = scipy.ndimage.convolve(
+            self.board.astype(np.int8), NEIGHBORS, mode="constant"
+        )
+
+        # Zero regions are labelled lazily, on the first flood reveal
+        self.regions = None
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    def is_mine(self, cell):
+        i, j = cell
+        return bool(self.board[i, j])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        i, j = cell
+        return int(self.counts[i, j])
+
+    def reveal(self, cell):
+        """
+        Returns the set of cells revealed by clicking on a safe `cell`.
+        If the cell has no neighboring mines, the whole connected region
+        of zero cells is revealed along with the numbered cells bordering
+        it, as in the classic game.
+        """
+        i, j = cell
+        if self.board[i, j]:
+            raise Exception("Cell is a mine")
+        if self.counts[i, j] != 0:
+            return {cell}
+
+        # Label all zero regions at once, connecting diagonal neighbors
+        if self.regions is None:
+            zeros = (self.counts == 0) & ~self.board
+            self.regions, _ = scipy.ndimage.label(
+                zeros, structure=np.ones((3, 3))
+            )
+
+        # Grow the region by one cell to include its numbered border
+        region = self.regions == self.regions[i, j]
+        region = scipy.ndimage.binary_dilation(
+            region, structure=np.ones((3, 3))
+        ) & ~self.board
+        return set((int(i), int(j)) for i, j in zip(*np.nonzero(region)))
@@ -0,0 +1,109 @@
+import multiprocessing
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+GAMES = 100
+
+# Board configurations to simulate, as (height, width, mine density)
+BOARDS = [
+    (8, 8, 0.125),
+    (16, 16, 0.15),
+    (16, 30, 0.2)
+]
+
+
+def main():
+
+    # Check command-line arguments
+    if len(sys.argv) not in [1, 2, 5]:
+        sys.exit("Usage: python simulate.py [games [height width density]]")
+    games = int(sys.argv[1]) if len(sys.argv) >= 2 else GAMES
+    boards = BOARDS
+    if len(sys.argv) == 5:
+        boards = [(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))]
+
+    # Simulate every board configuration with the same seeds
+    for height, width, density in boards:
+        mines = max(1, round(height * width * density))
+        start = time.perf_counter()
+        results = simulate(games, height, width, mines)
+        wall = time.perf_counter() - start
+
+        wins = sum(result["won"] for result in results)
+        moves = sum(result["moves"] for result in results)
+        elapsed = sum(result["time"] for result in results)
+        knowledge = sum(result["knowledge_time"] for result in results)
+        print(f"{height}x{width}, {mines} mines ({games} games, {wall:.2f}s)")
+        print(f"  Win rate: {wins / games:.2%}")
+        print(f"  Moves per second: {moves / elapsed:.1f}")
+        print(f"  add_knowledge per move: {1000 * knowledge / moves:.3f}ms")
+
+
+def simulate(games, height, width, mines, processes=None):
+    """
+    Play `games` seeded games of Minesweeper across a process pool.
+    Game `i` is played with seed `i`, so the same call always
+    replays the same boards and random moves.
+
+    Return a list with the result of every game, in seed order.
+    """
+    args = [(height, width, mines, seed) for seed in range(games)]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(play, args)
+
+
+def play(height, width, mines, seed):
+    """
+    Play one game of Minesweeper with the AI making every move,
+    seeding the random module with `seed` first.
+
+    Return a dictionary with whether the AI won, the number of moves
+    made, the total time spent and the time spent in `add_knowledge`.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width)
+    safe_cells = height * width - mines
+
+    moves = 0
+    knowledge_time = 0
+    start = time.perf_counter()
+    while True:
+
+        # Game is won once every safe cell has been revealed
+        if len(ai.moves_made) == safe_cells:
+            won = True
+            break
+
+        # Prefer a known safe move, falling back to a random one
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                won = ai.mines == game.mines
+                break
+
+        moves += 1
+        if game.is_mine(move):
+            won = False
+            break
+
+        # Only time the inference, not the board lookups
+        nearby = game.nearby_mines(move)
+        tic = time.perf_counter()
+        ai.add_knowledge(move, nearby)
+        knowledge_time += time.perf_counter() - tic
+
+    return {
+        "won": won,
+        "moves": moves,
+        "time": time.perf_counter() - start,
+        "knowledge_time": knowledge_time
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import random
+import sys
+import time
+
+from heredity import enumerate_probabilities, load_data
+from elimination import eliminate
+from sampling import change, gibbs, likelihood_weighting
+from vectorized import vectorized_probabilities
+
+# Sizes of generated families to time exact inference on
+SIZES = [50, 100, 200, 400]
+
+# Sample budgets to compare approximate inference at
+BUDGETS = [1000, 10000]
+
+# Sample budget for approximate inference on the large family
+LARGE_BUDGET = 5000
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    # Check that exact methods agree with enumeration on small families
+    families = {
+        f"data/family{i}.csv": load_data(f"data/family{i}.csv")
+        for i in range(3)
+    }
+    for seed in range(3):
+        families[f"generated (n = 7, seed {seed})"] = generate_family(7, seed)
+    methods = {
+        "elimination": eliminate,
+        "vectorized": vectorized_probabilities
+    }
+    samplers = {
+        "likelihood weighting": likelihood_weighting,
+        "gibbs": gibbs
+    }
+    for name, people in families.items():
+        start = time.perf_counter()
+        exact = enumerate_probabilities(people)
+        elapsed = time.perf_counter() - start
+        print(f"{name}")
+        print(f"  enumeration: {elapsed:.4f}s")
+        for method, infer in methods.items():
+            start = time.perf_counter()
+            probabilities = infer(people)
+            elapsed = time.perf_counter() - start
+            error = change(exact, probabilities)
+            print(f"  {method}: {elapsed:.4f}s, max difference {error:.2e}")
+
+        # Sample the full budget, so accuracy can be compared against time
+        for method, infer in samplers.items():
+            for samples in BUDGETS:
+                start = time.perf_counter()
+                probabilities = infer(
+                    people, samples=samples, tolerance=0, seed=0
+                )
+                elapsed = time.perf_counter() - start
+                error = change(exact, probabilities)
+                print(f"  {method} (n = {samples}): {elapsed:.4f}s, "
+                      f"max difference {error:.2e}")
+
+    # Time elimination on larger generated families
+    print("Variable elimination")
+    for n in SIZES:
+        people = generate_family(n, seed=0)
+        start = time.perf_counter()
+        eliminate(people)
+        elapsed = time.perf_counter() - start
+        print(f"  n = {n}: {elapsed:.3f}s")
+
+    # Compare sampling with elimination on a large family with inbreeding
+    n = SIZES[-1] // 2
+    people = generate_family(n, seed=0, inbreeding=0.05)
+    print(f"Generated (n = {n}, with inbreeding)")
+    start = time.perf_counter()
+    exact = eliminate(people)
+    elapsed = time.perf_counter() - start
+    print(f"  elimination: {elapsed:.3f}s")
+    for method, infer in samplers.items():
+        start = time.perf_counter()
+        probabilities = infer(people, samples=LARGE_BUDGET, seed=0)
+        elapsed = time.perf_counter() - start
+        error = change(exact, probabilities)
+        print(f"  {method}: {elapsed:.3f}s, max difference {error:.2e}")
+
+
+def generate_family(n, seed=None, inbreeding=0):
+    """
+    Generate a pedigree with `n` people, in the format
+    returned by `load_data`. About half of the people have a known trait.
+
+    Every couple is made of one member of the family and a founder
+    marrying in, so the pedigree is tree-shaped, except that with
+    probability `inbreeding` a child starts a couple with someone
+    already in the family instead, closing a loop.
+    """
+    rng = random.Random(seed)
+    people = {}
+
+    def add(mother=None, father=None):
+        name = f"Person{len(people)}"
+        people[name] = {
+            "name": name,
+            "mother": mother,
+            "father": father,
+            "trait": rng.choice([True, False, None, None])
+        }
+        return name
+
+    couples = [(add(), add())]
+    while len(people) < n:
+        mother, father = rng.choice(couples)
+        child = add(mother, father)
+
+        # Some children start a couple of their own, usually with a founder
+        if rng.random() < inbreeding:
+            spouse = rng.choice([p for p in people if p != child])
+        elif len(people) < n and rng.random() < 0.5:
+            spouse = add()
+        else:
+            continue
+        couples.append(
+            (child, spouse) if rng.random() < 0.5 else (spouse, child)
+        )
+
+    return people
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import heapq
+import itertools
+
+from heredity import PROBS, empty_probabilities
+
+# Possible number of copies of the gene a person can have
+GENES = (0, 1, 2)
+
+
+class Factor():
+    """
+    Non-negative function over the gene counts of a tuple of people,
+    stored as a table from gene-count tuples to values.
+    """
+
+    def __init__(self, variables, table):
+        self.variables = tuple(variables)
+        self.table = table
+
+    def __mul__(self, other):
+        variables = self.variables + tuple(
+            v for v in other.variables if v not in self.variables
+        )
+        left = [variables.index(v) for v in self.variables]
+        right = [variables.index(v) for v in other.variables]
+        table = {}
+        for genes in itertools.product(GENES, repeat=len(variables)):
+            table[genes] = (
+                self.table[tuple(genes[k] for k in left)] *
+                other.table[tuple(genes[k] for k in right)]
+            )
+        return Factor(variables, table)
+
+    def marginalize(self, variables):
+        """
+        Return a new factor over `variables` by summing out every other
+        variable, scaled so its values sum to 1.
+        Scaling keeps long chains of messages from underflowing and does
+        not change any normalized marginal.
+        """
+        variables = tuple(variables)
+        positions = [self.variables.index(v) for v in variables]
+        table = dict.fromkeys(
+            itertools.product(GENES, repeat=len(variables)), 0
+        )
+        for genes, value in self.table.items():
+            table[tuple(genes[k] for k in positions)] += value
+        total = sum(table.values())
+        if total > 0:
+            for genes in table:
+                table[genes] /= total
+        return Factor(variables, table)
+
+
+def eliminate(people):
+    """
+    Compute gene and trait probabilities for each person by exact
+    inference on a junction tree built from a variable elimination order.
+
+    Return a dictionary with the same structure as `heredity.main` builds,
+    with every distribution normalized. For tree-shaped pedigrees every
+    clique stays small, so the cost grows linearly with family size.
+    """
+    order, cliques, parents = junction_tree(people)
+
+    # Assign every factor to the clique of its first eliminated variable
+    position = {person: k for k, person in enumerate(order)}
+    potentials = {
+        person: Factor(cliques[person], dict.fromkeys(
+            itertools.product(GENES, repeat=len(cliques[person])), 1
+        ))
+        for person in order
+    }
+    for factor in pedigree_factors(people):
+        first = min(factor.variables, key=position.get)
+        potentials[first] = potentials[first] * factor
+
+    children = {person: [] for person in order}
+    for person in order:
+        if parents[person] is not None:
+            children[parents[person]].append(person)
+
+    # Upward pass: cliques send messages towards the root of their tree,
+    # and every clique is eliminated before its parent
+    upward = {}
+    for person in order:
+        if parents[person] is None:
+            continue
+        factor = potentials[person]
+        for child in children[person]:
+            factor = factor * upward[child]
+        upward[person] = factor.marginalize(separator(cliques, person))
+
+    # Downward pass: parents send messages back to each of their children
+    downward = {}
+    for person in reversed(order):
+        for child in children[person]:
+            factor = potentials[person]
+            if person in downward:
+                factor = factor * downward[person]
+            for other in children[person]:
+                if other != child:
+                    factor = factor * upward[other]
+            downward[child] = factor.marginalize(separator(cliques, child))
+
+    # Each person's marginal comes from the clique that eliminated them
+    probabilities = empty_probabilities(people)
+    for person in order:
+        belief = potentials[person]
+        if person in downward:
+            belief = belief * downward[person]
+        for child in children[person]:
+            belief = belief * upward[child]
+        marginal = belief.marginalize([person])
+
+        trait = people[person]["trait"]
+        for gene in GENES:
+            probabilities[person]["gene"][gene] = marginal.table[gene,]
+        if trait is None:
+            have_trait = sum(
+                marginal.table[gene,] * PROBS["trait"][gene][True]
+                for gene in GENES
+            )
+        else:
+            have_trait = 1 if trait else 0
+        probabilities[person]["trait"][True] = have_trait
+        probabilities[person]["trait"][False] = 1 - have_trait
+
+    return probabilities
+
+
+def pedigree_factors(people):
+    """
+    Return the list of factors whose product is the joint distribution
+    of everyone's gene count together with the known traits.
+    Unknown traits sum to 1 over their values and are left out.
+    """
+    mutation = PROBS["mutation"]
+
+    # Probability of passing the gene on, given a parent's gene count
+    passes = {0: mutation, 1: 0.5, 2: 1 - mutation}
+
+    factors = []
+    for person in people:
+        mother = people[person]["mother"]
+        father = people[person]["father"]
+        if mother is None:
+            factors.append(Factor((person,), {
+                (gene,): PROBS["gene"][gene] for gene in GENES
+            }))
+        else:
+            table = {}
+            for m_gene, f_gene in itertools.product(GENES, repeat=2):
+                m, f = passes[m_gene], passes[f_gene]
+                table[0, m_gene, f_gene] = (1 - m) * (1 - f)
+                table[1, m_gene, f_gene] = m * (1 - f) + (1 - m) * f
+                table[2, m_gene, f_gene] = m * f
+            factors.append(Factor((person, mother, father), table))
+
+        trait = people[person]["trait"]
+        if trait is not None:
+            factors.append(Factor((person,), {
+                (gene,): PROBS["trait"][gene][trait] for gene in GENES
+            }))
+
+    return factors
+
+
+def junction_tree(people):
+    """
+    Choose an elimination order for the moral graph of the pedigree
+    (each child connected to both parents, and parents to each other)
+    using the greedy min-fill heuristic.
+
+    Return a tuple `(order, cliques, parents)`: the elimination order,
+    the clique formed by eliminating each person, and the person whose
+    clique is the parent of that clique in the junction tree
+    (None at the root of each connected family).
+    """
+    graph = {person: set() for person in people}
+    for person in people:
+        mother = people[person]["mother"]
+        father = people[person]["father"]
+        if mother is None:
+            continue
+        for a, b in itertools.combinations((person, mother, father), 2):
+            graph[a].add(b)
+            graph[b].add(a)
+
+    def fill(person):
+        return sum(
+            1 for a, b in itertools.combinations(graph[person], 2)
+            if b not in graph[a]
+        )
+
+    # Priority queue of (fill-in, degree, tie-break, person); stale entries
+    # are skipped when their person has since been rescored
+    counter = itertools.count()
+    scores = {}
+    heap = []
+    for person in graph:
+        scores[person] = (fill(person), len(graph[person]))
+        heapq.heappush(heap, (*scores[person], next(counter), person))
+
+    order = []
+    cliques = {}
+    while heap:
+        *score, _, person = heapq.heappop(heap)
+        if person in cliques or tuple(score) != scores[person]:
+            continue
+
+        # Eliminate person, connecting all of their remaining neighbors
+        neighbors = graph.pop(person)
+        cliques[person] = (person,) + tuple(neighbors)
+        order.append(person)
+        for a in neighbors:
+            graph[a].discard(person)
+            graph[a].update(b for b in neighbors if b != a)
+        for a in neighbors:
+            scores[a] = (fill(a), len(graph[a]))
+            heapq.heappush(heap, (*scores[a], next(counter), a))
+
+    # Each clique hangs off the clique of its next eliminated variable
+    position = {person: k for k, person in enumerate(order)}
+    parents = {
+        person: min(cliques[person][1:], key=position.get, default=None)
+        for person in order
+    }
+    return order, cliques, parents
+
+
+def separator(cliques, person):
+    """
+    Return the variables shared by `person`'s clique and its parent,
+    which is every variable in the clique except `person`.
+    """
+    return cliques[person][1:]
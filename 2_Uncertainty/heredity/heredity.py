@@ -40,12 +40,45 @@ PROBS = {
 def main():
 
     # Check for proper usage
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python heredity.py data.csv")
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python heredity.py data.csv [method]")
     people = load_data(sys.argv[1])
+    method = sys.argv[2] if len(sys.argv) == 3 else "enumeration"
+
+    # Compute gene and trait probabilities for each person
+    if method == "enumeration":
+        probabilities = enumerate_probabilities(people)
+    elif method == "elimination":
+        from elimination import eliminate
+        probabilities = eliminate(people)
+    elif method == "vectorized":
+        from vectorized import vectorized_probabilities
+        probabilities = vectorized_probabilities(people)
+    elif method == "likelihood":
+        from sampling import likelihood_weighting
+        probabilities = likelihood_weighting(people)
+    elif method == "gibbs":
+        from sampling import gibbs
+        probabilities = gibbs(people)
+    else:
+        sys.exit(f"Unknown method: {method}")
 
-    # Keep track of gene and trait probabilities for each person
-    probabilities = {
+    # Print results
+    for person in people:
+        print(f"{person}:")
+        for field in probabilities[person]:
+            print(f"  {field.capitalize()}:")
+            for value in probabilities[person][field]:
+                p = probabilities[person][field][value]
+                print(f"    {value}: {p:.4f}")
+
+
+def empty_probabilities(people):
+    """
+    Return a probabilities dictionary with every gene and trait
+    distribution for every person in `people` set to 0.
+    """
+    return {
         person: {
             "gene": {
                 2: 0,
@@ -60,6 +93,17 @@ def main():
         for person in people
     }
 
+
+def enumerate_probabilities(people):
+    """
+    Compute gene and trait probabilities for each person by enumerating
+    every joint assignment consistent with the known traits.
+    Cost grows like 2^n * 3^n, so this is only usable for small families.
+    """
+
+    # Keep track of gene and trait probabilities for each person
+    probabilities = empty_probabilities(people)
+
     # Loop over all sets of people who might have the trait
     names = set(people)
     # print(names)
@@ -84,15 +128,7 @@ def main():
 
     # Ensure probabilities sum to 1
     normalize(probabilities)
-
-    # Print results
-    for person in people:
-        print(f"{person}:")
-        for field in probabilities[person]:
-            print(f"  {field.capitalize()}:")
-            for value in probabilities[person][field]:
-                p = probabilities[person][field][value]
-                print(f"    {value}: {p:.4f}")
+    return probabilities
 
 
 def load_data(filename):
@@ -0,0 +1,287 @@
+import math
+import random
+import warnings
+
+from heredity import PROBS, empty_probabilities
+
+# Maximum number of samples (or Gibbs sweeps) to draw
+SAMPLES = 100000
+
+# Samples drawn between convergence checks
+BATCH = 1000
+
+# Stop once the standard error of every probability is below this
+TOLERANCE = 0.005
+
+# Fewest batches of Gibbs sweeps to estimate the standard error from
+MIN_BATCHES = 5
+
+# Warn when likelihood weighting ends with a smaller effective sample size
+MIN_EFFECTIVE = 100
+
+# Gibbs sweeps discarded before any are counted
+BURN_IN = 100
+
+
+def gene_distribution(people, person, genes):
+    """
+    Return the list of probabilities of `person` having 0, 1 or 2 copies
+    of the gene, given the gene counts `genes` of their parents.
+    """
+    mother = people[person]["mother"]
+    if mother is None:
+        return [PROBS["gene"][gene] for gene in range(3)]
+
+    mutation = PROBS["mutation"]
+    passes = {0: mutation, 1: 0.5, 2: 1 - mutation}
+    m = passes[genes[mother]]
+    f = passes[genes[people[person]["father"]]]
+    return [(1 - m) * (1 - f), m * (1 - f) + (1 - m) * f, m * f]
+
+
+def evidence(people, person, gene):
+    """
+    Return the probability of `person`'s known trait given `gene`,
+    or 1 if their trait is unknown.
+    """
+    trait = people[person]["trait"]
+    if trait is None:
+        return 1
+    return PROBS["trait"][gene][trait]
+
+
+def topological_order(people):
+    """
+    Return a list of everyone in `people`, with parents before children.
+    """
+    order = []
+    placed = set()
+
+    def place(person):
+        if person in placed:
+            return
+        for parent in (people[person]["mother"], people[person]["father"]):
+            if parent is not None:
+                place(parent)
+        placed.add(person)
+        order.append(person)
+
+    for person in people:
+        place(person)
+    return order
+
+
+def likelihood_weighting(people, samples=SAMPLES, tolerance=TOLERANCE,
+                         batch=BATCH, seed=None):
+    """
+    Estimate gene and trait probabilities for each person by likelihood
+    weighting: sample everyone's gene from their parents, and weight
+    each sample by the probability of the known traits.
+
+    Weights are kept as logarithms, since their products underflow on
+    large families. The weights summed so far are stored relative to the
+    largest weight seen (log-sum-exp), and rescaled when a larger one
+    arrives.
+
+    Sampling stops after `samples` samples, or earlier once the effective
+    sample size is large enough that the standard error of every
+    estimate, at most 0.5 / sqrt(effective size), is below `tolerance`.
+    When a few samples carry nearly all of the weight, as with many known
+    traits, the effective size stays small and sampling runs to the end.
+    If it is still below `MIN_EFFECTIVE` then, the estimates rest on a
+    handful of samples and a warning is raised. On large pedigrees with
+    many known traits this is the usual outcome: use `gibbs` or
+    `elimination.eliminate` for those instead.
+    """
+    rng = random.Random(seed)
+    order = topological_order(people)
+    gene_mass = {person: [0, 0, 0] for person in people}
+    trait_mass = {person: 0 for person in people}
+
+    # Largest log-weight so far, and the sums of the weights and squared
+    # weights relative to it
+    shift = None
+    total = 0
+    squares = 0
+
+    for n in range(1, samples + 1):
+        genes = {}
+        log_weight = 0
+        for person in order:
+            distribution = gene_distribution(people, person, genes)
+            genes[person] = rng.choices(range(3), weights=distribution)[0]
+            p = evidence(people, person, genes[person])
+            log_weight += math.log(p) if p > 0 else -math.inf
+
+        # Rescale the sums when this is the largest weight so far
+        if log_weight > -math.inf:
+            if shift is None or log_weight > shift:
+                if shift is not None:
+                    scale = math.exp(shift - log_weight)
+                    for person in people:
+                        gene_mass[person] = [
+                            mass * scale for mass in gene_mass[person]
+                        ]
+                        trait_mass[person] *= scale
+                    total *= scale
+                    squares *= scale ** 2
+                shift = log_weight
+            weight = math.exp(log_weight - shift)
+        else:
+            weight = 0
+        total += weight
+        squares += weight ** 2
+
+        # Count unknown traits by their expected value given the gene
+        for person in order:
+            gene = genes[person]
+            gene_mass[person][gene] += weight
+            trait_mass[person] += weight * trait_probability(
+                people, person, [int(g == gene) for g in range(3)]
+            )
+
+        if n % batch == 0 and total > 0:
+            effective = total ** 2 / squares
+            if 0.5 / math.sqrt(effective) < tolerance:
+                break
+
+    effective = total ** 2 / squares if total > 0 else 0
+    if effective < MIN_EFFECTIVE:
+        warnings.warn(
+            f"Likelihood weighting ended with an effective sample size of "
+            f"{effective:.1f}; its estimates are unreliable"
+        )
+    return estimates(people, gene_mass, trait_mass)
+
+
+def gibbs(people, samples=SAMPLES, tolerance=TOLERANCE, batch=BATCH,
+          burn_in=BURN_IN, seed=None):
+    """
+    Estimate gene and trait probabilities for each person by Gibbs
+    sampling: repeatedly resample each person's gene given everyone else,
+    keeping the known traits fixed.
+
+    Each sweep counts every person's full conditional distribution rather
+    than only the sampled gene, which lowers the variance of the estimate.
+    Sampling stops after `samples` sweeps, or earlier once the standard
+    error of every estimate is below `tolerance`. The standard error is
+    estimated from the spread of the estimates of separate batches of
+    sweeps (batch means), which accounts for successive sweeps being
+    correlated.
+    """
+    rng = random.Random(seed)
+    order = topological_order(people)
+    children = {person: [] for person in people}
+    for person in people:
+        if people[person]["mother"] is not None:
+            children[people[person]["mother"]].append(person)
+            children[people[person]["father"]].append(person)
+
+    # Start from a sample of the prior
+    genes = {}
+    for person in order:
+        distribution = gene_distribution(people, person, genes)
+        genes[person] = rng.choices(range(3), weights=distribution)[0]
+
+    gene_mass = {person: [0, 0, 0] for person in people}
+    trait_mass = {person: 0 for person in people}
+    batch_gene = {person: [0, 0, 0] for person in people}
+    batch_trait = {person: 0 for person in people}
+    batches = []
+
+    for n in range(1, burn_in + samples + 1):
+        for person in order:
+
+            # Full conditional of person's gene given everyone else
+            prior = gene_distribution(people, person, genes)
+            conditional = []
+            for gene in range(3):
+                genes[person] = gene
+                p = prior[gene] * evidence(people, person, gene)
+                for child in children[person]:
+                    p *= gene_distribution(people, child, genes)[genes[child]]
+                conditional.append(p)
+            total = sum(conditional)
+            conditional = [p / total for p in conditional]
+            genes[person] = rng.choices(range(3), weights=conditional)[0]
+
+            if n > burn_in:
+                trait = trait_probability(people, person, conditional)
+                for gene in range(3):
+                    gene_mass[person][gene] += conditional[gene]
+                    batch_gene[person][gene] += conditional[gene]
+                trait_mass[person] += trait
+                batch_trait[person] += trait
+
+        # Keep each batch's own estimate, and stop once they agree
+        sweeps = n - burn_in
+        if sweeps > 0 and sweeps % batch == 0:
+            batches.append(estimates(people, batch_gene, batch_trait))
+            batch_gene = {person: [0, 0, 0] for person in people}
+            batch_trait = {person: 0 for person in people}
+            if (len(batches) >= MIN_BATCHES
+                    and standard_error(batches) < tolerance):
+                break
+
+    return estimates(people, gene_mass, trait_mass)
+
+
+def trait_probability(people, person, genes):
+    """
+    Return the probability that `person` has the trait, given a
+    distribution `genes` over their gene count.
+    """
+    trait = people[person]["trait"]
+    if trait is not None:
+        return 1 if trait else 0
+    return sum(genes[gene] * PROBS["trait"][gene][True] for gene in range(3))
+
+
+def estimates(people, gene_mass, trait_mass):
+    """
+    Return a normalized probabilities dictionary from accumulated
+    gene and trait weights.
+    """
+    probabilities = empty_probabilities(people)
+    for person in people:
+        total = sum(gene_mass[person])
+        if total == 0:
+            raise Exception(f"No weight on any gene count for {person}")
+        for gene in range(3):
+            p = gene_mass[person][gene] / total
+            probabilities[person]["gene"][gene] = p
+        have_trait = trait_mass[person] / total
+        probabilities[person]["trait"][True] = have_trait
+        probabilities[person]["trait"][False] = 1 - have_trait
+    return probabilities
+
+
+def standard_error(batches):
+    """
+    Return the largest standard error of the mean over a list of
+    probabilities dictionaries, each estimated from one batch.
+    """
+    k = len(batches)
+    first = batches[0]
+    largest = 0
+    for person in first:
+        for field in first[person]:
+            for value in first[person][field]:
+                ps = [batch[person][field][value] for batch in batches]
+                mean = sum(ps) / k
+                variance = sum((p - mean) ** 2 for p in ps) / (k - 1)
+                largest = max(largest, math.sqrt(variance / k))
+    return largest
+
+
+def change(a, b):
+    """
+    Return the largest absolute change between two probabilities
+    dictionaries over the same people.
+    """
+    return max(
+        abs(a[person][field][value] - b[person][field][value])
+        for person in a
+        for field in a[person]
+        for value in a[person][field]
+    )
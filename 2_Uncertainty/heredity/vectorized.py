@@ -0,0 +1,97 @@
+import numpy as np
+
+from heredity import PROBS, empty_probabilities
+
+# Number of gene assignments scored together in one block
+BLOCK = 2 ** 16
+
+# Log-probability of each gene count for people with no parents listed
+LOG_GENE = np.log([PROBS["gene"][gene] for gene in range(3)])
+
+# Probability of each trait value (column) given a gene count (row)
+TRAIT = np.array([
+    [PROBS["trait"][gene][False], PROBS["trait"][gene][True]]
+    for gene in range(3)
+])
+
+
+def inheritance():
+    """
+    Return a 3x3x3 array whose entry [child, mother, father] is the
+    probability of the child's gene count given each parent's gene count.
+    """
+    mutation = PROBS["mutation"]
+    passes = np.array([mutation, 0.5, 1 - mutation])
+    m = passes[:, None]
+    f = passes[None, :]
+    return np.array([
+        (1 - m) * (1 - f),
+        m * (1 - f) + (1 - m) * f,
+        m * f
+    ])
+
+
+def vectorized_probabilities(people, block=BLOCK):
+    """
+    Compute the same gene and trait probabilities as enumeration,
+    scoring blocks of gene assignments at a time with NumPy.
+
+    Gene assignment `k` gives person `i` the gene count of the i-th
+    base 3 digit of `k`. Each block computes the log joint probability
+    of its assignments and the known traits in one pass, then adds each
+    assignment's weight to every person's gene count with a single
+    scatter-add. Unknown traits are summed out in closed form instead
+    of being enumerated, since P(trait | gene) is all they depend on.
+    """
+    names = list(people)
+    n = len(names)
+    index = {name: i for i, name in enumerate(names)}
+
+    # Split people into founders and children of known parents
+    founders = [index[p] for p in names if people[p]["mother"] is None]
+    children = [index[p] for p in names if people[p]["mother"] is not None]
+    mothers = [index[people[names[i]]["mother"]] for i in children]
+    fathers = [index[people[names[i]]["father"]] for i in children]
+    observed = [index[p] for p in names if people[p]["trait"] is not None]
+    traits = [int(people[names[i]]["trait"]) for i in observed]
+    log_inherit = np.log(inheritance())
+    log_trait = np.log(TRAIT)
+
+    gene_mass = np.zeros(3 * n)
+    trait_mass = np.zeros(n)
+    total = 0
+    powers = 3 ** np.arange(n, dtype=np.int64)
+    offsets = 3 * np.arange(n)
+    for start in range(0, 3 ** n, block):
+        codes = np.arange(start, min(start + block, 3 ** n), dtype=np.int64)
+        genes = (codes[:, None] // powers) % 3
+
+        # Log joint probability of each assignment in the block
+        log_p = LOG_GENE[genes[:, founders]].sum(axis=1)
+        log_p += log_inherit[
+            genes[:, children], genes[:, mothers], genes[:, fathers]
+        ].sum(axis=1)
+        log_p += log_trait[genes[:, observed], traits].sum(axis=1)
+        p = np.exp(log_p)
+
+        # Weighted scatter-add of every assignment into each person's genes
+        gene_mass += np.bincount(
+            (genes + offsets).ravel(),
+            weights=np.repeat(p, n),
+            minlength=3 * n
+        )
+        trait_mass += p @ TRAIT[genes, 1]
+        total += p.sum()
+
+    # Known traits are certain under every consistent assignment
+    trait_mass[observed] = np.array(traits) * total
+
+    probabilities = empty_probabilities(people)
+    for i, person in enumerate(names):
+        genes = gene_mass[3 * i:3 * i + 3] / gene_mass[3 * i:3 * i + 3].sum()
+        for gene in range(3):
+            probabilities[person]["gene"][gene] = float(genes[gene])
+        have_trait = float(trait_mass[i] / total)
+        probabilities[person]["trait"][True] = have_trait
+        probabilities[person]["trait"][False] = 1 - have_trait
+    return probabilities
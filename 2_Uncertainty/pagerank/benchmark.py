@@ -0,0 +1,196 @@
+import copy
+import random
+import sys
+import time
+
+import numpy as np
+
+from pagerank import DAMPING, SAMPLES, crawl, iterate_pagerank, sample_pagerank
+from matrix import (METHODS, corpus_edges, personalized_power_iteration,
+                    power_iteration, sparse_pagerank, transition_matrix)
+from surfer import fast_sample_pagerank, surfer_pagerank
+from incremental import update_pagerank
+
+# Sizes of generated corpora to time the sparse backend on
+SIZES = [1000, 10000, 100000]
+
+# Largest corpus to also time the dictionary implementation on
+DICT_LIMIT = 1000
+
+# Damping factors to compare iteration methods at
+DAMPINGS = [DAMPING, 0.99]
+
+# Number of personalization vectors to compute together
+SEGMENTS = 100
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    # Compare with the dictionary implementation on the bundled corpora
+    for directory in ["corpus0", "corpus1", "corpus2"]:
+        corpus = crawl(directory)
+        expected = iterate_pagerank(copy.deepcopy(corpus), DAMPING)
+        ranks = sparse_pagerank(corpus, DAMPING)
+        error = max(abs(ranks[page] - expected[page]) for page in corpus)
+        print(f"{directory}: max difference {error:.2e}")
+
+    # Time both implementations on generated power-law corpora
+    for n in SIZES:
+        corpus = generate_corpus(n, seed=0)
+        print(f"Generated corpus (n = {n})")
+        if n <= DICT_LIMIT:
+            start = time.perf_counter()
+            iterate_pagerank(copy.deepcopy(corpus), DAMPING)
+            elapsed = time.perf_counter() - start
+            print(f"  iterate_pagerank: {elapsed:.3f}s")
+        start = time.perf_counter()
+        sparse_pagerank(corpus, DAMPING)
+        elapsed = time.perf_counter() - start
+        print(f"  sparse_pagerank: {elapsed:.3f}s")
+
+    # Compare iteration methods on the bundled and a generated corpus
+    corpora = {
+        directory: crawl(directory)
+        for directory in ["corpus0", "corpus1", "corpus2"]
+    }
+    corpora[f"generated (n = {SIZES[-1]})"] = generate_corpus(SIZES[-1], 0)
+    for name, corpus in corpora.items():
+        pages, sources, targets = corpus_edges(corpus)
+        matrix, dangling = transition_matrix(len(pages), sources, targets)
+        for damping in DAMPINGS:
+            print(f"{name}, damping {damping}")
+            for method in METHODS:
+                start = time.perf_counter()
+                _, iterations = power_iteration(
+                    matrix, dangling, damping, method=method
+                )
+                elapsed = time.perf_counter() - start
+                print(f"  {method}: {iterations} iterations, {elapsed:.3f}s")
+
+    # Personalized ranks for many segments, batched and one at a time
+    n = SIZES[-1]
+    pages, sources, targets = corpus_edges(generate_corpus(n, seed=0))
+    matrix, dangling = transition_matrix(n, sources, targets)
+    personalization = np.random.default_rng(0).random((n, SEGMENTS)) ** 8
+    print(f"{SEGMENTS} personalization vectors on generated corpus (n = {n})")
+    start = time.perf_counter()
+    ranks, iterations = personalized_power_iteration(
+        matrix, dangling, personalization, DAMPING
+    )
+    batched = time.perf_counter() - start
+    print(f"  batched: {iterations} iterations, {batched:.3f}s")
+    start = time.perf_counter()
+    for c in range(SEGMENTS):
+        personalized_power_iteration(
+            matrix, dangling, personalization[:, [c]], DAMPING
+        )
+    elapsed = time.perf_counter() - start
+    print(f"  separately: {elapsed:.3f}s "
+          f"({elapsed / batched:.1f}x the batched time)")
+
+    # Time the samplers, with the error of each against exact ranks
+    corpus = generate_corpus(DICT_LIMIT, seed=0)
+    exact = sparse_pagerank(corpus, DAMPING)
+    samplers = {
+        "sample_pagerank": sample_pagerank,
+        "fast_sample_pagerank": fast_sample_pagerank,
+        "surfer_pagerank": surfer_pagerank
+    }
+    print(f"Sampling (n = {SAMPLES}) on generated corpus (n = {DICT_LIMIT})")
+    for name, sample in samplers.items():
+        start = time.perf_counter()
+        ranks = sample(corpus, DAMPING, SAMPLES)
+        elapsed = time.perf_counter() - start
+        error = sum(abs(ranks.get(page, 0) - exact[page]) for page in exact)
+        print(f"  {name}: {elapsed:.3f}s, L1 error {error:.3f}")
+    for n in [SAMPLES * 10, SAMPLES * 100]:
+        start = time.perf_counter()
+        ranks = surfer_pagerank(corpus, DAMPING, n)
+        elapsed = time.perf_counter() - start
+        error = sum(abs(ranks[page] - exact[page]) for page in exact)
+        print(f"  surfer_pagerank (n = {n}): {elapsed:.3f}s, "
+              f"L1 error {error:.3f}")
+
+    # Update ranks after a small change, against recomputing them
+    n = SIZES[-1]
+    corpus = generate_corpus(n, seed=0)
+    ranks = sparse_pagerank(corpus, DAMPING)
+    print(f"Incremental update on generated corpus (n = {n})")
+    for changes in [10, 100]:
+        delta = generate_delta(corpus, changes, seed=0)
+        start = time.perf_counter()
+        new_corpus, new_ranks = update_pagerank(corpus, ranks, delta, DAMPING)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = sparse_pagerank(new_corpus, DAMPING)
+        full = time.perf_counter() - start
+        error = max(abs(new_ranks[page] - expected[page]) for page in expected)
+        print(f"  {changes} changes: {elapsed:.3f}s "
+              f"(recompute {full:.3f}s), max difference {error:.2e}")
+
+
+def generate_corpus(n, seed=None, dangling=0.1):
+    """
+    Generate a corpus of `n` pages whose in-degrees follow a power law,
+    by preferential attachment: each new page links to a few earlier
+    pages, chosen in proportion to how many links they already have.
+    A fraction `dangling` of pages have no links at all.
+
+    Return a dictionary in the same format as `crawl`.
+    """
+    rng = random.Random(seed)
+    pages = [f"{i}.html" for i in range(n)]
+    corpus = {page: set() for page in pages}
+
+    # Every page appears once, plus once more for every link to it
+    targets = [pages[0]]
+    for i in range(1, n):
+        if rng.random() >= dangling:
+            for _ in range(rng.randint(1, 8)):
+                corpus[pages[i]].add(rng.choice(targets))
+            targets.extend(corpus[pages[i]])
+        targets.append(pages[i])
+
+        # Occasionally link back from an earlier page to keep cycles
+        earlier = pages[rng.randrange(i)]
+        if corpus[earlier] and rng.random() < 0.3:
+            corpus[earlier].add(pages[i])
+            targets.append(pages[i])
+
+    return corpus
+
+
+def generate_delta(corpus, changes, seed=None):
+    """
+    Generate a random change to `corpus` in the format returned by
+    `incremental.corpus_delta`, with about `changes` links added,
+    half as many removed, and a few pages added and removed.
+    """
+    rng = random.Random(seed)
+    pages = sorted(corpus)
+    removed = set(rng.sample(pages, max(1, changes // 10)))
+    kept = [page for page in pages if page not in removed]
+    added = {f"new{i}.html" for i in range(max(1, changes // 4))}
+    delta = {
+        "pages_added": added,
+        "pages_removed": removed,
+        "links_added": set(),
+        "links_removed": set()
+    }
+    for page in added:
+        delta["links_added"].update(
+            (page, link) for link in rng.sample(kept, 3)
+        )
+    for _ in range(changes):
+        delta["links_added"].add(tuple(rng.sample(kept, 2)))
+    for page in rng.sample(kept, changes // 2):
+        if corpus[page]:
+            link = rng.choice(sorted(corpus[page]))
+            delta["links_removed"].add((page, link))
+    return delta
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import json
+import multiprocessing
+import os
+import re
+import sys
+
+import numpy as np
+
+from pagerank import DAMPING
+from matrix import power_iteration, transition_matrix
+
+# Number of characters read from a file at a time
+CHUNK_SIZE = 2 ** 16
+
+# Number of files handed to a worker process at a time
+BATCH = 64
+
+# Number of top-ranked pages to print
+TOP = 10
+
+LINK = re.compile(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python crawler.py corpus [cache.json]")
+    cache = sys.argv[2] if len(sys.argv) == 3 else None
+    pages, sources, targets = crawl_edges(sys.argv[1], cache)
+    matrix, dangling = transition_matrix(len(pages), sources, targets)
+    ranks, iterations = power_iteration(matrix, dangling, DAMPING)
+    print(f"Crawled {len(pages)} pages with {len(sources)} links")
+    print(f"PageRank Results after {iterations} iterations (top {TOP})")
+    for i in np.argsort(-ranks)[:TOP]:
+        print(f"  {pages[i]}: {ranks[i]:.4f}")
+
+
+def extract_links(path):
+    """
+    Return the set of links in the HTML file at `path`, reading it
+    in chunks so that large files are never held in memory at once.
+    """
+    links = set()
+    tail = ""
+    with open(path) as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            text = tail + chunk
+            links.update(LINK.findall(text))
+
+            # Carry over the last tag, in case it continues in the next chunk
+            cut = max(text.rfind("<"), len(text) - CHUNK_SIZE)
+            tail = text[cut:]
+    return links
+
+
+def scan(entry):
+    """
+    Extract the links of one file, given a tuple `(path, mtime, size)`.
+    Return a tuple `(filename, mtime, size, links)`.
+    """
+    path, mtime, size = entry
+    return os.path.basename(path), mtime, size, sorted(extract_links(path))
+
+
+def crawl_edges(directory, cache=None, processes=None):
+    """
+    Parse a directory of HTML pages on a process pool and number its pages.
+
+    Return a tuple `(pages, sources, targets)` in the same format as
+    `matrix.corpus_edges`: a sorted list of page names, and integer arrays
+    with one entry per link between two different pages of the corpus.
+
+    If `cache` is the path of a JSON file, links extracted on earlier runs
+    are read from it and only files whose modification time or size
+    changed are parsed again. The cache is then updated.
+    """
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".html") and entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = (entry.path, stat.st_mtime_ns, stat.st_size)
+
+    # Reuse cached links for files that have not changed
+    cached = {}
+    if cache is not None and os.path.exists(cache):
+        with open(cache) as f:
+            cached = json.load(f)
+    links = {}
+    stale = []
+    for filename, (path, mtime, size) in files.items():
+        if filename in cached and cached[filename][:2] == [mtime, size]:
+            links[filename] = cached[filename][2]
+        else:
+            stale.append((path, mtime, size))
+
+    # Parse every changed file on a process pool
+    if stale:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.imap_unordered(scan, stale, chunksize=BATCH)
+            for filename, mtime, size, found in results:
+                links[filename] = found
+                cached[filename] = [mtime, size, found]
+
+    if cache is not None:
+        for filename in list(cached):
+            if filename not in files:
+                del cached[filename]
+        with open(cache, "w") as f:
+            json.dump(cached, f)
+
+    # Intern page names, keeping only links between pages of the corpus
+    pages = sorted(files)
+    index = {page: i for i, page in enumerate(pages)}
+    sources = []
+    targets = []
+    for page in pages:
+        i = index[page]
+        for link in links[page]:
+            j = index.get(link)
+            if j is not None and j != i:
+                sources.append(i)
+                targets.append(j)
+
+    return (
+        pages,
+        np.array(sources, dtype=np.int64),
+        np.array(targets, dtype=np.int64)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import json
+import os
+import sys
+from collections import deque
+
+from pagerank import DAMPING, crawl
+from matrix import sparse_pagerank
+
+# Stop pushing once no page has a residual larger than this
+TOLERANCE = 1e-10
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python incremental.py corpus state.json")
+    corpus = crawl(sys.argv[1])
+    state = sys.argv[2]
+
+    # Warm-start from the saved ranks when there are any
+    if os.path.exists(state):
+        old_corpus, ranks = load_state(state)
+        delta = corpus_delta(old_corpus, corpus)
+        corpus, ranks = update_pagerank(old_corpus, ranks, delta, DAMPING)
+        print(f"Updated PageRank after {len(delta['pages_added'])} pages "
+              f"added, {len(delta['pages_removed'])} removed, "
+              f"{len(delta['links_added'])} links added, "
+              f"{len(delta['links_removed'])} removed")
+    else:
+        ranks = sparse_pagerank(corpus, DAMPING)
+        print("Computed PageRank from scratch")
+    save_state(state, corpus, ranks)
+
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+
+
+def load_state(filename):
+    """
+    Load a corpus and its PageRank values saved by `save_state`.
+    Return a tuple `(corpus, ranks)`.
+    """
+    with open(filename) as f:
+        state = json.load(f)
+    corpus = {page: set(links) for page, links in state["corpus"].items()}
+    return corpus, state["ranks"]
+
+
+def save_state(filename, corpus, ranks):
+    """
+    Save a corpus and its PageRank values to a JSON file,
+    so a later run can update them incrementally.
+    """
+    with open(filename, "w") as f:
+        json.dump({
+            "corpus": {page: sorted(links) for page, links in corpus.items()},
+            "ranks": ranks
+        }, f)
+
+
+def corpus_delta(old, new):
+    """
+    Return the changes that turn corpus `old` into corpus `new`, as a
+    dictionary with sets "pages_added" and "pages_removed" of page names,
+    and sets "links_added" and "links_removed" of `(page, link)` pairs.
+    Links on removed pages, or to them, are implied by removing the page.
+    """
+    delta = {
+        "pages_added": set(new) - set(old),
+        "pages_removed": set(old) - set(new),
+        "links_added": set(),
+        "links_removed": set()
+    }
+    for page in new:
+        links = old.get(page, set())
+        delta["links_added"].update((page, link) for link in new[page] - links)
+        delta["links_removed"].update(
+            (page, link) for link in links - new[page]
+            if link in new
+        )
+    return delta
+
+
+def apply_delta(corpus, delta):
+    """
+    Return a tuple `(new_corpus, changed)` with the corpus that results
+    from applying `delta` to `corpus`, and the set of pages of the new
+    corpus whose links changed (including every added page).
+    `corpus` itself is not modified.
+    """
+    removed = delta["pages_removed"]
+    new_corpus = {page: corpus[page] for page in corpus if page not in removed}
+    for page in delta["pages_added"]:
+        new_corpus[page] = set()
+    changed = set(delta["pages_added"])
+
+    # Pages linking to a removed page lose that link
+    if removed:
+        for page, links in new_corpus.items():
+            if links & removed:
+                new_corpus[page] = links - removed
+                changed.add(page)
+
+    for page, link in delta["links_removed"]:
+        if page in new_corpus and link in new_corpus[page]:
+            if page not in changed:
+                new_corpus[page] = set(new_corpus[page])
+            new_corpus[page].discard(link)
+            changed.add(page)
+    for page, link in delta["links_added"]:
+        if page in new_corpus and link in new_corpus and link != page:
+            if page not in changed:
+                new_corpus[page] = set(new_corpus[page])
+            new_corpus[page].add(link)
+            changed.add(page)
+
+    return new_corpus, changed
+
+
+def update_pagerank(corpus, ranks, delta, damping_factor,
+                    tolerance=TOLERANCE):
+    """
+    Update PageRank values `ranks` of `corpus` after applying `delta`
+    (in the format returned by `corpus_delta`), starting from the old
+    values instead of from a uniform distribution.
+
+    Only the links of changed pages differ between the old and new
+    PageRank equations, so the old values leave a residual only around
+    those pages, plus a uniform residual on every page when the number
+    of pages or the rank of pages with no links changes. That uniform
+    part only rescales the solution, so it is dropped and the ranks are
+    normalized at the end. The rest is pushed along links, page by page,
+    until no page's residual is above `tolerance`, which touches only
+    the region the change reaches.
+
+    Return a tuple `(new_corpus, new_ranks)`.
+    """
+    new_corpus, changed = apply_delta(corpus, delta)
+    pages = list(new_corpus)
+    index = {page: i for i, page in enumerate(pages)}
+    n = len(corpus)
+    d = damping_factor
+
+    old_ranks = ranks
+    ranks = [old_ranks.get(page, 0) for page in pages]
+    residuals = [0] * len(pages)
+
+    # Added pages start from zero, short of last run's uniform terms
+    dangling = sum(
+        old_ranks[page] for page, links in corpus.items() if not links
+    )
+    for page in delta["pages_added"]:
+        residuals[index[page]] = (1 - d) / n + d * dangling / n
+
+    # Replace the old contributions of changed pages by their new ones
+    for page in changed | delta["pages_removed"]:
+        links = corpus.get(page)
+        if links:
+            share = d * old_ranks[page] / len(links)
+            for link in links:
+                if link in index:
+                    residuals[index[link]] -= share
+    for page in changed:
+        links = new_corpus[page]
+        if links:
+            share = d * ranks[index[page]] / len(links)
+            for link in links:
+                residuals[index[link]] += share
+
+    queue = deque(
+        i for i, residual in enumerate(residuals) if abs(residual) > tolerance
+    )
+    queued = set(queue)
+    out = {}
+
+    # Push residuals along links until every one is within tolerance;
+    # pages with no links spread theirs uniformly, which only rescales
+    while queue:
+        i = queue.popleft()
+        queued.discard(i)
+        residual = residuals[i]
+        ranks[i] += residual
+        residuals[i] = 0
+
+        links = out.get(i)
+        if links is None:
+            links = out[i] = [index[link] for link in new_corpus[pages[i]]]
+        if not links:
+            continue
+        share = d * residual / len(links)
+        for j in links:
+            residuals[j] += share
+            if j not in queued and not -tolerance <= residuals[j] <= tolerance:
+                queue.append(j)
+                queued.add(j)
+
+    total = sum(ranks)
+    return new_corpus, {
+        page: rank / total for page, rank in zip(pages, ranks)
+    }
+
+
+if __name__ == "__main__":
+    main()
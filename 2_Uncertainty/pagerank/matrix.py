@@ -0,0 +1,339 @@
+import sys
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+from pagerank import DAMPING, crawl
+
+# Stop iterating once the L1 change between iterations is below this
+TOLERANCE = 1e-10
+
+# Give up on convergence after this many iterations
+MAX_ITERATIONS = 1000
+
+# Iterations between extrapolation steps
+EXTRAPOLATE = 10
+
+# Personalization vectors iterated together in one sparse product
+BLOCK = 16
+
+# Iterations between convergence checks of a block of personalizations
+CHECK = 2
+
+# Iteration methods accepted by `power_iteration`
+METHODS = ["power", "gauss-seidel", "aitken", "quadratic"]
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python matrix.py corpus")
+    corpus = crawl(sys.argv[1])
+    ranks = sparse_pagerank(corpus, DAMPING)
+    print("PageRank Results from Sparse Iteration")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+
+
+def corpus_edges(corpus):
+    """
+    Number the pages of `corpus` and list its links as integer arrays.
+
+    Return a tuple `(pages, sources, targets)` where `pages` is a sorted
+    list of page names and each link goes from page `sources[k]` to
+    page `targets[k]`, as indices into `pages`.
+    Links to pages outside the corpus are left out.
+    """
+    pages = sorted(corpus)
+    index = {page: i for i, page in enumerate(pages)}
+    sources = []
+    targets = []
+    for page in pages:
+        for link in corpus[page]:
+            if link in index:
+                sources.append(index[page])
+                targets.append(index[link])
+    return (
+        pages,
+        np.array(sources, dtype=np.int64),
+        np.array(targets, dtype=np.int64)
+    )
+
+
+def transition_matrix(n, sources, targets):
+    """
+    Build the link matrix of `n` pages from arrays of link endpoints.
+
+    Return a tuple `(matrix, dangling)`. `matrix` is a sparse CSR matrix
+    whose entry [j, i] is 1 / (number of links on page i) if page i links
+    to page j, so multiplying it by a rank vector follows every link once.
+    `dangling` is a boolean array marking pages with no links, which are
+    treated as linking to every page (including themselves).
+    Duplicate links and links from a page to itself are ignored.
+    """
+    keys = np.unique(sources[sources != targets] * n +
+                     targets[sources != targets])
+    sources, targets = np.divmod(keys, n)
+    counts = np.bincount(sources, minlength=n)
+    matrix = scipy.sparse.csr_matrix(
+        (1 / counts[sources], (targets, sources)), shape=(n, n)
+    )
+    return matrix, counts == 0
+
+
+def power_iteration(matrix, dangling, damping_factor,
+                    tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS,
+                    method="power"):
+    """
+    Return a tuple `(ranks, iterations)` with the PageRank vector of the
+    link matrix and the number of iterations it took to converge.
+
+    Rather than adding a dense column for every dangling page, their rank
+    is spread over all pages as a single rank-one correction.
+    Iteration stops once the L1 norm of the residual (the change the last
+    update made) is below `tolerance`, or after `max_iterations`
+    iterations. `method` is one of:
+
+        * "power": plain Jacobi updates, x <- d(Mx + dangling) + (1 - d)/n
+        * "gauss-seidel": update pages in order, in place, so that each
+          page already uses the new ranks of the pages before it
+        * "aitken": power steps, with componentwise Aitken extrapolation
+          every `EXTRAPOLATE` iterations
+        * "quadratic": power steps, with quadratic extrapolation from the
+          last four iterates every `EXTRAPOLATE` iterations
+
+    An extrapolated vector is kept only if its residual is lower than
+    that of the iterate it would replace; checking costs one update,
+    which is wasted when the extrapolation is rejected.
+    """
+    if method not in METHODS:
+        raise Exception(f"Unknown method: {method}")
+    n = matrix.shape[0]
+    d = damping_factor
+
+    def step(ranks):
+        spread = ranks[dangling].sum() / n
+        return d * (matrix @ ranks + spread) + (1 - d) / n
+
+    # Gauss-Seidel solves (I - dL) x' = d U x + c by forward substitution,
+    # with L and U the parts of the matrix below and above the diagonal
+    if method == "gauss-seidel":
+        lower = (
+            scipy.sparse.identity(n, format="csr") -
+            d * scipy.sparse.tril(matrix, -1, format="csr")
+        ).tocsr()
+        upper = scipy.sparse.triu(matrix, 1, format="csr")
+
+    ranks = np.full(n, 1 / n)
+    history = []
+    following = None
+    for iteration in range(1, max_iterations + 1):
+        if following is not None:
+            new_ranks, following = following, None
+        elif method == "gauss-seidel":
+            spread = ranks[dangling].sum() / n
+            new_ranks = scipy.sparse.linalg.spsolve_triangular(
+                lower, d * (upper @ ranks + spread) + (1 - d) / n,
+                lower=True, unit_diagonal=True
+            )
+            new_ranks /= new_ranks.sum()
+        else:
+            new_ranks = step(ranks)
+
+        # Stop once the update barely changes the ranks
+        residual = np.abs(new_ranks - ranks).sum()
+        if residual < tolerance:
+            ranks = new_ranks
+            break
+
+        # Extrapolate, keeping the estimate only if its residual is lower,
+        # in which case its update is the next iteration's
+        if method in ["aitken", "quadratic"]:
+            history = (history + [new_ranks])[-4:]
+            if iteration % EXTRAPOLATE == 0 and len(history) == 4:
+                if method == "aitken":
+                    estimate = aitken(*history[-3:])
+                else:
+                    estimate = quadratic(*history)
+                update = step(estimate)
+                if np.abs(update - estimate).sum() < residual:
+                    new_ranks, following = estimate, update
+                history = []
+
+        ranks = new_ranks
+    return ranks, iteration
+
+
+def aitken(x0, x1, x2):
+    """
+    Return the componentwise Aitken extrapolation of three successive
+    iterates, keeping the last iterate wherever the estimate is unstable
+    or not positive, normalized to sum to 1.
+    """
+    first = x1 - x0
+    second = x2 - 2 * x1 + x0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranks = x2 - (x2 - x1) ** 2 / second
+    keep = (np.abs(second) < 1e-15) | ~np.isfinite(ranks) | (ranks <= 0)
+    keep |= np.abs(first) < 1e-15
+    ranks[keep] = x2[keep]
+    return ranks / ranks.sum()
+
+
+def quadratic(x0, x1, x2, x3):
+    """
+    Return the quadratic extrapolation of four successive iterates
+    (Kamvar et al., 2003), which removes the components of the error
+    along the second and third eigenvectors, normalized to sum to 1.
+    """
+    y = np.column_stack([x1 - x0, x2 - x0])
+    gamma, *_ = np.linalg.lstsq(y, -(x3 - x0), rcond=None)
+    g1, g2, g3 = gamma[0], gamma[1], 1
+    ranks = (g1 + g2 + g3) * x1 + (g2 + g3) * x2 + g3 * x3
+    if not np.all(np.isfinite(ranks)) or ranks.sum() <= 0:
+        return x3
+    ranks = np.maximum(ranks, 0)
+    return ranks / ranks.sum()
+
+
+def personalized_power_iteration(matrix, dangling, personalization,
+                                 damping_factor, tolerance=TOLERANCE,
+                                 max_iterations=MAX_ITERATIONS, block=BLOCK):
+    """
+    Run power iteration for many personalization vectors at once.
+
+    `personalization` is an (n x k) array whose columns are teleport
+    distributions over pages: the surfer jumps to page i of column c
+    with probability proportional to `personalization[i, c]`, and pages
+    with no links also follow it. Columns are solved `block` at a time,
+    each iteration being one sparse-times-dense product over the block,
+    which reads the link matrix once for all of its columns.
+
+    Return a tuple `(ranks, iterations)` where `ranks` is an (n x k)
+    array holding one PageRank vector per column, and `iterations` is the
+    most iterations any block needed. Each column stops once its L1
+    change, checked every `CHECK` iterations, is below `tolerance`.
+    """
+    n = matrix.shape[0]
+    teleport = np.asarray(personalization, dtype=float)
+    teleport = teleport / teleport.sum(axis=0)
+
+    # The damped link matrix, with an extra row summing the rank of the
+    # dangling pages, so one product gives both for every column
+    links = scipy.sparse.vstack([
+        damping_factor * matrix,
+        scipy.sparse.csr_matrix(np.asarray(dangling, dtype=float)[None, :])
+    ]).tocsr()
+
+    ranks = np.empty_like(teleport)
+    iterations = 0
+    for start in range(0, teleport.shape[1], block):
+        columns = np.arange(start, min(start + block, teleport.shape[1]))
+        count = power_block(
+            links, teleport, ranks, columns, damping_factor, tolerance,
+            max_iterations
+        )
+        iterations = max(iterations, count)
+    return ranks, iterations
+
+
+def power_block(links, teleport, ranks, columns, damping_factor, tolerance,
+                max_iterations):
+    """
+    Run power iteration on the `columns` of the normalized `teleport`
+    array, writing each PageRank vector into the same column of `ranks`
+    once it converges. `links` is the damped link matrix with a last row
+    marking the dangling pages. Return the number of iterations.
+
+    The convergence test costs nearly as much as the rest of an
+    iteration, so it is only made every `CHECK` iterations. Columns that
+    have converged are dropped from the block, and later products skip
+    them.
+    """
+    n = teleport.shape[0]
+    d = damping_factor
+    teleport = np.ascontiguousarray(teleport[:, columns])
+    current = teleport.copy()
+    work = np.empty_like(teleport)
+    ones = np.ones(n)
+    for iteration in range(1, max_iterations + 1):
+
+        # Follow links, and teleport with the rank that does not
+        product = links @ current
+        new = product[:n]
+        np.multiply(teleport, d * product[n] + (1 - d), out=work)
+        new += work
+
+        # Keep the columns whose ranks barely changed, and drop them. A
+        # product sums the columns much faster than numpy's reduction
+        # along the short rows of the block
+        if iteration % CHECK == 0 or iteration == max_iterations:
+            np.subtract(new, current, out=work)
+            done = ones @ np.abs(work, out=work) < tolerance
+            if done.any():
+                ranks[:, columns[done]] = new[:, done]
+                columns = columns[~done]
+                if not len(columns):
+                    break
+                new = np.ascontiguousarray(new[:, ~done])
+                teleport = np.ascontiguousarray(teleport[:, ~done])
+                work = np.empty_like(teleport)
+        current = new
+    else:
+        ranks[:, columns] = current
+    return iteration
+
+
+def personalized_pagerank(corpus, personalization, damping_factor,
+                          tolerance=TOLERANCE):
+    """
+    Return PageRank values of `corpus` for every column of the (n x k)
+    array `personalization`, whose rows follow the pages of `corpus` in
+    sorted order (see `topic_matrix`).
+
+    Return a tuple `(pages, ranks)` with the sorted list of page names and
+    an (n x k) array holding one PageRank vector per column.
+    """
+    pages, sources, targets = corpus_edges(corpus)
+    matrix, dangling = transition_matrix(len(pages), sources, targets)
+    ranks, _ = personalized_power_iteration(
+        matrix, dangling, personalization, damping_factor, tolerance
+    )
+    return pages, ranks
+
+
+def topic_matrix(pages, topics):
+    """
+    Build a personalization array for topic-sensitive PageRank.
+    `topics` is a list of sets of page names; column c teleports
+    uniformly to the pages of `topics[c]`.
+    """
+    index = {page: i for i, page in enumerate(pages)}
+    personalization = np.zeros((len(pages), len(topics)))
+    for c, topic in enumerate(topics):
+        for page in topic:
+            personalization[index[page], c] = 1
+    return personalization
+
+
+def sparse_pagerank(corpus, damping_factor, tolerance=TOLERANCE,
+                    method="power"):
+    """
+    Return PageRank values for each page by power iteration over a sparse
+    transition matrix, built once from `corpus`, using one of the
+    iteration methods of `power_iteration`.
+
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value (a value between 0 and 1). All
+    PageRank values should sum to 1.
+    """
+    pages, sources, targets = corpus_edges(corpus)
+    matrix, dangling = transition_matrix(len(pages), sources, targets)
+    ranks, _ = power_iteration(
+        matrix, dangling, damping_factor, tolerance, method=method
+    )
+    return {page: float(rank) for page, rank in zip(pages, ranks)}
+
+
+if __name__ == "__main__":
+    main()
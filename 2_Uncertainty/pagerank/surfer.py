@@ -0,0 +1,107 @@
+import math
+import random
+import sys
+
+import numpy as np
+
+from pagerank import DAMPING, SAMPLES, crawl
+from matrix import corpus_edges
+
+# Most independent random surfers simulated together
+SURFERS = 1000
+
+# Steps each surfer takes before its visits are counted, in multiples of
+# 1 / (1 - damping_factor), the expected steps between random jumps
+BURN_IN = 5
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python surfer.py corpus")
+    corpus = crawl(sys.argv[1])
+    ranks = fast_sample_pagerank(corpus, DAMPING, SAMPLES)
+    print(f"PageRank Results from Sampling (n = {SAMPLES})")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+    ranks = surfer_pagerank(corpus, DAMPING, SAMPLES)
+    print(f"PageRank Results from {SURFERS} Surfers (n = {SAMPLES})")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+
+
+def fast_sample_pagerank(corpus, damping_factor, n):
+    """
+    Return PageRank values for each page by sampling `n` pages
+    according to transition model, starting with a page at random.
+
+    Rather than building the whole transition model for every sample,
+    each step follows a random link on the current page with probability
+    `damping_factor` and otherwise jumps to a random page, which takes
+    constant time per sample. Pages with no links always jump.
+
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value (a value between 0 and 1). All
+    PageRank values should sum to 1.
+    """
+    pages = list(corpus)
+    links = {page: tuple(corpus[page]) for page in pages}
+    counts = dict.fromkeys(pages, 0)
+
+    page = random.choice(pages)
+    counts[page] += 1
+    for i in range(n - 1):
+        if links[page] and random.random() < damping_factor:
+            page = random.choice(links[page])
+        else:
+            page = random.choice(pages)
+        counts[page] += 1
+
+    return {page: counts[page] / n for page in pages}
+
+
+def surfer_pagerank(corpus, damping_factor, n, surfers=SURFERS, seed=None):
+    """
+    Return PageRank values for each page by simulating `surfers`
+    independent random surfers in parallel with NumPy, for a total of
+    about `n` samples. Every surfer starts on a page at random and moves
+    according to the same rule as `fast_sample_pagerank`.
+
+    A surfer's first steps still depend on where it started, so each
+    takes a burn-in of BURN_IN / (1 - damping_factor) steps before its
+    visits are counted. There are fewer surfers if needed so that each
+    counts at least as many steps as it burns in.
+
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value (a value between 0 and 1). All
+    PageRank values should sum to 1.
+    """
+    rng = np.random.default_rng(seed)
+    pages, sources, targets = corpus_edges(corpus)
+    count = len(pages)
+
+    # Group links by the page they are on, like a CSR matrix
+    order = np.argsort(sources, kind="stable")
+    links = targets[order]
+    degree = np.bincount(sources, minlength=count)
+    start = np.concatenate(([0], np.cumsum(degree)[:-1]))
+
+    burn_in = math.ceil(BURN_IN / (1 - damping_factor))
+    surfers = max(1, min(surfers, n // burn_in))
+    steps = max(1, -(-n // surfers))
+    current = rng.integers(count, size=surfers)
+    visits = np.zeros(count, dtype=np.int64)
+    for i in range(burn_in + steps):
+        follow = (degree[current] > 0) & (rng.random(surfers) < damping_factor)
+        offsets = (rng.random(surfers) * degree[current]).astype(np.int64)
+        following = current[follow]
+        current = rng.integers(count, size=surfers)
+        current[follow] = links[start[following] + offsets[follow]]
+        if i >= burn_in:
+            visits += np.bincount(current, minlength=count)
+
+    total = visits.sum()
+    return {page: float(visits[i] / total) for i, page in enumerate(pages)}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from crossword import *
+from bitset import BitsetCrosswordCreator
+
+# Largest conflict set recorded as a nogood
+NOGOOD_SIZE = 8
+
+
+class BackjumpCrosswordCreator(BitsetCrosswordCreator):
+
+    def __init__(self, crossword):
+        """
+        Create new CSP crossword generator that maintains arc consistency
+        with conflict-directed backjumping, and learns nogoods.
+        """
+        super().__init__(crossword)
+
+        # Assigned variables whose values explain each domain's pruning,
+        # and the explanations they replaced, for undoing
+        self.explanations = {
+            var: frozenset() for var in self.crossword.variables
+        }
+        self.history = []
+
+        # Learned nogoods, as frozensets of (variable, word) pairs,
+        # indexed by each of their pairs
+        self.nogoods = dict()
+
+        # Variables of the same length, which may not repeat a word
+        self.same_length = {
+            var: [
+                v for v in self.crossword.variables
+                if v != var and v.length == var.length
+            ]
+            for var in self.crossword.variables
+        }
+
+    def backtrack(self, assignment):
+        """
+        Using Backtracking Search, take as input a partial assignment for the
+        crossword and return a complete assignment if possible to do so.
+
+        If no assignment is possible, return None.
+        """
+        result, _ = self.backjump(assignment)
+        return result
+
+    def backjump(self, assignment):
+        """
+        Extend `assignment` by maintaining arc consistency with
+        conflict-directed backjumping (Prosser, 1993).
+
+        Every variable's conflict set collects the assigned variables that
+        explain its failures: those that pruned its own domain, those that
+        pruned a domain its values emptied, and those of failures further
+        down. When every value fails, search jumps straight back to the
+        most recent variable in the conflict set, skipping the ones in
+        between, which could not have caused the failure. The conflict
+        set's values are also recorded as a nogood, so the same
+        combination is rejected wherever it comes up again.
+
+        Return a tuple `(assignment, conflict)`: the complete assignment and
+        None, or None and the set of assigned variables to jump back to.
+        """
+        if self.assignment_complete(assignment):
+            return assignment, None
+        var = self.select_unassigned_variable(assignment)
+        conflict = set(self.explanations[var])
+        for value in self.order_domain_values(var, assignment):
+            nogood = self.violated(var, value, assignment)
+            if nogood is not None:
+                conflict.update(v for v, _ in nogood if v != var)
+                continue
+
+            assignment[var] = value
+            mark = len(self.trail), len(self.history)
+            wipeout = self.propagate(var, value, assignment)
+            if wipeout is None:
+                result, jump = self.backjump(assignment)
+                if result is not None:
+                    return result, None
+
+                # Jump over this variable if it played no part
+                if var not in jump:
+                    self.retract(mark)
+                    del assignment[var]
+                    return None, jump
+                conflict.update(jump)
+            else:
+                conflict.update(self.explanations[wipeout])
+            conflict.discard(var)
+            self.retract(mark)
+            del assignment[var]
+
+        self.learn(conflict, assignment)
+        return None, conflict
+
+    def propagate(self, var, value, assignment):
+        """
+        Restrict the domain of `var` to `value`, remove `value` from the
+        domains of unassigned variables of the same length, and maintain
+        arc consistency from there.
+        Return a variable whose domain is emptied, or None.
+        """
+        self.restrict(var, value)
+        self.explain(var, frozenset([var]), replace=True)
+        arcs = [(v, var) for v in self.crossword.neighbors(var)]
+
+        bit = self.vocabulary.bit(value)
+        for v in self.same_length[var]:
+            if v not in assignment and self.domains[v] & bit:
+                self.prune(v, bit)
+                self.explain(v, self.explanations[var])
+                if not self.domains[v]:
+                    return v
+                arcs.extend((z, v) for z in self.crossword.neighbors(v))
+
+        if self.ac3(arcs):
+            return None
+        return next(
+            v for v in self.crossword.variables if not self.domains[v]
+        )
+
+    def revise(self, x, y):
+        """
+        Make variable `x` arc consistent with variable `y`, adding
+        whatever explains the domain of `y` to the explanation of `x`.
+        Return True if a revision was made to the domain of `x`.
+        """
+        if super().revise(x, y):
+            self.explain(x, self.explanations[y])
+            return True
+        return False
+
+    def explain(self, var, reason, replace=False):
+        """
+        Add the assigned variables in `reason` to the explanation of the
+        domain of `var`, or make them its explanation if `replace` is True.
+        """
+        old = self.explanations[var]
+        new = reason if replace else old | reason
+        if new != old:
+            self.history.append((var, old))
+            self.explanations[var] = new
+
+    def retract(self, mark):
+        """
+        Undo the pruning and explanations since the trail and history
+        had the lengths in `mark`.
+        """
+        trail, history = mark
+        self.undo(trail)
+        while len(self.history) > history:
+            var, old = self.history.pop()
+            self.explanations[var] = old
+
+    def violated(self, var, value, assignment):
+        """
+        Return a learned nogood that assigning `value` to `var` would
+        complete given `assignment`, or None if there is none.
+        """
+        for nogood in self.nogoods.get((var, value), []):
+            if all(
+                v == var or assignment.get(v) == word
+                for v, word in nogood
+            ):
+                return nogood
+        return None
+
+    def learn(self, conflict, assignment):
+        """
+        Record the values of the variables in `conflict` as a nogood:
+        together, they leave the failed variable no consistent value.
+        """
+        if not conflict or len(conflict) > NOGOOD_SIZE:
+            return
+        nogood = frozenset((v, assignment[v]) for v in conflict)
+        for pair in nogood:
+            self.nogoods.setdefault(pair, []).append(nogood)
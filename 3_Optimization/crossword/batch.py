@@ -0,0 +1,53 @@
+import sys
+import time
+
+from crossword import Crossword
+from backjump import BackjumpCrosswordCreator
+from vocabulary import load_vocabulary
+
+# Suffix of the file a words file's preprocessed vocabulary is cached in
+CACHE_SUFFIX = ".vocabulary"
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python batch.py words structure [structure ...]")
+    words = sys.argv[1]
+    structures = sys.argv[2:]
+
+    # Preprocess the vocabulary once, or load it from the cache
+    start = time.perf_counter()
+    vocabulary = load_vocabulary(words, cache=words + CACHE_SUFFIX)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {len(vocabulary.all)} words in {elapsed:.3f}s")
+
+    # Generate every puzzle against the same vocabulary
+    start = time.perf_counter()
+    solved = 0
+    for structure, assignment, elapsed in generate(structures, vocabulary):
+        result = "solved" if assignment is not None else "no solution"
+        print(f"  {structure}: {result} in {elapsed:.3f}s")
+        solved += assignment is not None
+    elapsed = time.perf_counter() - start
+    print(f"Generated {solved} of {len(structures)} puzzles in {elapsed:.3f}s "
+          f"({len(structures) / elapsed:.1f} puzzles per second)")
+
+
+def generate(structures, vocabulary):
+    """
+    Fill every structure file in `structures` with words of `vocabulary`.
+    Yield a tuple `(structure, assignment, elapsed)` for each, with the
+    assignment found (None if there is no solution) and the seconds
+    taken.
+    """
+    for structure in structures:
+        start = time.perf_counter()
+        crossword = Crossword(structure, vocabulary=vocabulary)
+        assignment = BackjumpCrosswordCreator(crossword).solve()
+        yield structure, assignment, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import multiprocessing
+import sys
+import time
+import tracemalloc
+
+from crossword import Crossword
+from generate import CrosswordCreator
+from bitset import BitsetCrosswordCreator
+from backjump import BackjumpCrosswordCreator
+from portfolio import configurations, portfolio_solve
+
+# Puzzles to time, as (structure, words) files
+PUZZLES = [
+    (f"data/structure{s}.txt", f"data/words{w}.txt")
+    for s in range(3) for w in range(3)
+]
+
+# Large grid (21x21, 160 variables) to time building and AC-3 on
+LARGE_PUZZLE = ("data/structure3.txt", "data/words2.txt")
+
+# Puzzle to measure memory use while solving
+MEMORY_PUZZLE = ("data/structure2.txt", "data/words2.txt")
+
+# Hard and unsatisfiable puzzles to compare search strategies on
+HARD_PUZZLES = [
+    (f"data/structure{s}.txt", "data/words2.txt") for s in range(4, 8)
+]
+
+# Seconds to let each solver run on a hard puzzle
+TIME_LIMIT = 20
+
+# Number of solver configurations to race on each hard puzzle
+PORTFOLIO = 4
+
+CREATORS = {
+    "sets": CrosswordCreator,
+    "bitsets": BitsetCrosswordCreator,
+    "backjump": BackjumpCrosswordCreator
+}
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    for structure, words in PUZZLES:
+        crossword = Crossword(structure, words)
+        print(f"{structure}, {words}")
+        for name, creator in CREATORS.items():
+            ac3, total, assignment = time_solve(creator(crossword))
+            result = "solved" if assignment is not None else "no solution"
+            print(f"  {name}: ac3 {ac3:.4f}s, solve {total:.4f}s, {result}")
+
+    # Time building the model and the initial AC-3 pass on a large grid
+    start = time.perf_counter()
+    crossword = Crossword(*LARGE_PUZZLE)
+    elapsed = time.perf_counter() - start
+    print(f"{', '.join(LARGE_PUZZLE)}: {len(crossword.variables)} variables, "
+          f"built in {elapsed:.4f}s")
+    for name, creator in CREATORS.items():
+        creator = creator(crossword)
+        creator.enforce_node_consistency()
+        start = time.perf_counter()
+        creator.ac3()
+        elapsed = time.perf_counter() - start
+        print(f"  {name}: ac3 {elapsed:.4f}s")
+
+    # Compare search strategies on hard puzzles, with a time limit
+    print(f"Hard puzzles (time limit {TIME_LIMIT}s)")
+    for structure, words in HARD_PUZZLES:
+        print(f"{structure}, {words}")
+        for name in CREATORS:
+            result = solve_with_limit(name, structure, words, TIME_LIMIT)
+            if result is None:
+                print(f"  {name}: timed out")
+            else:
+                solved, elapsed = result
+                result = "solved" if solved else "no solution"
+                print(f"  {name}: solve {elapsed:.3f}s, {result}")
+
+    # Race a portfolio of solver configurations on the hard puzzles
+    print(f"Hard puzzles with a portfolio of {PORTFOLIO} configurations")
+    for structure, words in HARD_PUZZLES:
+        start = time.perf_counter()
+        config, assignment = portfolio_solve(
+            structure, words, configurations(PORTFOLIO)
+        )
+        elapsed = time.perf_counter() - start
+        result = "solved" if assignment is not None else "no solution"
+        print(f"  {structure}: solve {elapsed:.3f}s, {result}, "
+              f"first from {config}")
+
+    # Measure peak memory allocated during the search itself
+    crossword = Crossword(*MEMORY_PUZZLE)
+    print(f"Peak memory while solving {', '.join(MEMORY_PUZZLE)}")
+    for name, creator in CREATORS.items():
+        peak = peak_memory(creator(crossword))
+        print(f"  {name}: {peak / 1024:.0f} KiB")
+
+
+def time_solve(creator):
+    """
+    Solve a crossword with `creator`, timing the initial AC-3 pass.
+    Return a tuple `(ac3, total, assignment)` of times in seconds
+    and the assignment found (None if there is no solution).
+    """
+    start = time.perf_counter()
+    creator.enforce_node_consistency()
+    ac3_start = time.perf_counter()
+    creator.ac3()
+    ac3 = time.perf_counter() - ac3_start
+    assignment = creator.backtrack(dict())
+    return ac3, time.perf_counter() - start, assignment
+
+
+def timed_solve(name, structure, words):
+    """
+    Solve a puzzle with the creator called `name` in `CREATORS`.
+    Return a tuple `(solved, elapsed)`.
+    """
+    creator = CREATORS[name](Crossword(structure, words))
+    start = time.perf_counter()
+    assignment = creator.solve()
+    return assignment is not None, time.perf_counter() - start
+
+
+def solve_with_limit(name, structure, words, limit):
+    """
+    Run `timed_solve` in a separate process for at most `limit` seconds.
+    Return its result, or None if it ran out of time.
+    """
+    with multiprocessing.Pool(1) as pool:
+        result = pool.apply_async(timed_solve, (name, structure, words))
+        try:
+            return result.get(limit)
+        except multiprocessing.TimeoutError:
+            return None
+
+
+def peak_memory(creator):
+    """
+    Return the peak number of bytes allocated while `creator` runs
+    backtracking search, after node and arc consistency.
+    """
+    creator.enforce_node_consistency()
+    creator.ac3()
+    tracemalloc.start()
+    creator.backtrack(dict())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from crossword import *
+from generate import CrosswordCreator
+
+
+class BitsetCrosswordCreator(CrosswordCreator):
+
+    def __init__(self, crossword):
+        """
+        Create new CSP crossword generator whose domains are bitsets
+        over the words of each variable's length, using the crossword's
+        `Vocabulary`.
+        """
+        self.crossword = crossword
+        self.vocabulary = crossword.vocabulary
+        self.domains = {
+            var: self.vocabulary.full(var.length)
+            for var in self.crossword.variables
+        }
+        self.trail = []
+        self.supports = None
+
+    def words(self, var):
+        """
+        Return the list of words in the domain of `var`.
+        """
+        return self.vocabulary.decode(var.length, self.domains[var])
+
+    def enforce_node_consistency(self):
+        """
+        Update `self.domains` such that each variable is node-consistent.
+        Domains only ever hold words of the variable's length, so this
+        just makes sure no other bits are set.
+        """
+        for var in self.crossword.variables:
+            self.domains[var] &= self.vocabulary.full(var.length)
+
+    def revise(self, x, y):
+        """
+        Make variable `x` arc consistent with variable `y`.
+
+        Rather than comparing every pair of words, gather the letters that
+        words of `y` can place on the overlapping cell, and keep the words
+        of `x` with one of those letters there: one AND and OR per letter.
+
+        Return True if a revision was made to the domain of `x`; return
+        False if no revision was made.
+        """
+        overlap = self.crossword.overlaps[x, y]
+        if overlap is None:
+            return False
+        i, j = overlap
+        support = self.vocabulary.support(
+            x.length, i, self.domains[y], y.length, j
+        )
+        removed = self.domains[x] & ~support
+        if not removed:
+            return False
+        self.prune(x, removed)
+        return True
+
+    def restrict(self, var, value):
+        """
+        Prune the domain of `var` down to `value` alone.
+        Bitsets of removed words subtract like sets, since they are
+        always within the domain, so the trail works unchanged.
+        """
+        self.prune(var, self.domains[var] & ~self.vocabulary.bit(value))
+
+    def singleton(self, var):
+        """
+        Return the only value left in the domain of `var`,
+        or None if there is not exactly one.
+        """
+        domain = self.domains[var]
+        if domain and not domain & (domain - 1):
+            return self.vocabulary.words[var.length][domain.bit_length() - 1]
+        return None
+
+    def order_domain_values(self, var, assignment):
+        """
+        Return a list of values in the domain of `var`, in order by
+        the number of values they rule out for neighboring variables.
+        Values ruled out are counted from the letter tables, as the
+        neighbor's domain size less the words that agree on the overlap.
+        """
+        neighbors = []
+        for v, (i, j) in self.crossword.adjacency[var].items():
+            if v not in assignment and self.domains[v]:
+                domain = self.domains[v]
+                neighbors.append((
+                    i, self.vocabulary.letters[v.length][j],
+                    domain, domain.bit_count()
+                ))
+
+        def ruled_out(word):
+            count = 0
+            for i, letters, domain, size in neighbors:
+                count += size - (letters.get(word[i], 0) & domain).bit_count()
+            return count
+
+        return sorted(self.words(var), key=ruled_out)
+
+    def select_unassigned_variable(self, assignment):
+        """
+        Return an unassigned variable not already part of `assignment`,
+        with the minimum number of remaining values in its domain and,
+        among those, the highest degree.
+        """
+        return min(
+            (var for var in self.crossword.variables if var not in assignment),
+            key=lambda var: (
+                self.domains[var].bit_count(),
+                -len(self.crossword.neighbors(var))
+            )
+        )
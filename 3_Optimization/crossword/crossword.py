@@ -1,3 +1,6 @@
+from vocabulary import load_vocabulary
+
+
 class Variable():
 
     ACROSS = "across"
@@ -37,7 +40,7 @@ class Variable():
 
 class Crossword():
 
-    def __init__(self, structure_file, words_file):
+    def __init__(self, structure_file, words_file=None, vocabulary=None):
 
         # Determine structure of crossword
         with open(structure_file) as f:
@@ -57,9 +60,12 @@ class Crossword():
                         row.append(False)
                 self.structure.append(row)
 
-        # Save vocabulary list
-        with open(words_file) as f:
-            self.words = set(f.read().upper().splitlines())
+        # Save vocabulary list, reading and indexing the words file
+        # only if no preprocessed vocabulary is given
+        if vocabulary is None:
+            vocabulary = load_vocabulary(words_file)
+        self.vocabulary = vocabulary
+        self.words = vocabulary.all
 
         # Determine variable set
         self.variables = set()
@@ -108,26 +114,34 @@ class Crossword():
         # For any pair of variables v1, v2, their overlap is either:
         #    None, if the two variables do not overlap; or
         #    (i, j), where v1's ith character overlaps v2's jth character
-        self.overlaps = dict()
-        for v1 in self.variables:
-            for v2 in self.variables:
-                if v1 == v2:
-                    continue
-                cells1 = v1.cells
-                cells2 = v2.cells
-                intersection = set(cells1).intersection(cells2)
-                if not intersection:
-                    self.overlaps[v1, v2] = None
-                else:
-                    intersection = intersection.pop()
-                    self.overlaps[v1, v2] = (
-                        cells1.index(intersection),
-                        cells2.index(intersection)
-                    )
+        # Only overlapping pairs are stored, found through the variables
+        # crossing each cell, and any other pair looks up as None
+        self.overlaps = Overlaps()
+        crossing = dict()
+        for v in self.variables:
+            for cell in v.cells:
+                crossing.setdefault(cell, []).append(v)
+        for cell, variables in crossing.items():
+            for v1 in variables:
+                for v2 in variables:
+                    if v1 != v2:
+                        self.overlaps[v1, v2] = (
+                            v1.cells.index(cell),
+                            v2.cells.index(cell)
+                        )
+
+        # Map each variable to its neighbors and their overlaps
+        self.adjacency = {v: dict() for v in self.variables}
+        for (v1, v2), overlap in self.overlaps.items():
+            self.adjacency[v1][v2] = overlap
 
     def neighbors(self, var):
         """Given a variable, return set of overlapping variables."""
-        return set(
-            v for v in self.variables
-            if v != var and self.overlaps[v, var]
-        )
+        return self.adjacency[var].keys()
+
+
+class Overlaps(dict):
+
+    def __missing__(self, key):
+        """Pairs of variables that do not overlap have no entry."""
+        return None
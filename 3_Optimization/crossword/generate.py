@@ -1,5 +1,5 @@
 import sys
-from collections import deque
+from collections import Counter, deque
 from crossword import *
 
 
@@ -11,10 +11,16 @@ class CrosswordCreator():
         """
         self.crossword = crossword
         self.domains = {
-            var: self.crossword.words.copy()
+            var: self.crossword.vocabulary.domain(var.length)
             for var in self.crossword.variables
         }
 
+        # Values removed from domains, in order, as (variable, values)
+        self.trail = []
+
+        # Per variable and overlapped position, words left per letter
+        self.supports = None
+
     def letter_grid(self, assignment):
         """
         Return 2D array representing a given assignment.
@@ -133,19 +139,67 @@ class CrosswordCreator():
         revised = False
         if self.crossword.overlaps[(x, y)]:
             (i, j) = self.crossword.overlaps[(x, y)]
-            # print(i, j)
-            for x_domain in self.domains[x].copy():
-                delete = True
-                for y_domain in self.domains[y].copy():
-                    if y_domain[j] == x_domain[i]:
-                        delete = False
-                if delete == True:
-                    # print (x, y)
-                    # print(x_domain)
-                    self.domains[x].remove(x_domain)
-                    revised = True
+            letters = {y_domain[j] for y_domain in self.domains[y]}
+            removed = {
+                x_domain for x_domain in self.domains[x]
+                if x_domain[i] not in letters
+            }
+            if removed:
+                self.prune(x, removed)
+                revised = True
         return revised
 
+    def prune(self, var, values):
+        """
+        Remove `values`, all of which are in the domain of `var`,
+        recording them on the trail so that `undo` can restore them.
+        """
+        self.domains[var] -= values
+        self.trail.append((var, values))
+        if self.supports is not None:
+            for i, counts in self.supports[var].items():
+                counts.subtract(value[i] for value in values)
+
+    def undo(self, mark):
+        """
+        Restore every value removed since the trail had length `mark`.
+        """
+        while len(self.trail) > mark:
+            var, values = self.trail.pop()
+            self.domains[var] |= values
+            if self.supports is not None:
+                for i, counts in self.supports[var].items():
+                    counts.update(value[i] for value in values)
+
+    def count_supports(self):
+        """
+        Count, for each variable and each position where a neighbor
+        overlaps it, how many words left in its domain have each letter
+        there. From then on, `prune` and `undo` keep the counts current.
+        """
+        self.supports = dict()
+        for var in self.crossword.variables:
+            positions = {i for i, _ in self.crossword.adjacency[var].values()}
+            self.supports[var] = {
+                i: Counter(value[i] for value in self.domains[var])
+                for i in positions
+            }
+
+    def restrict(self, var, value):
+        """
+        Prune the domain of `var` down to `value` alone.
+        """
+        self.prune(var, self.domains[var] - {value})
+
+    def singleton(self, var):
+        """
+        Return the only value left in the domain of `var`,
+        or None if there is not exactly one.
+        """
+        if len(self.domains[var]) == 1:
+            return next(iter(self.domains[var]))
+        return None
+
 
     def ac3(self, arcs=None):
         """
@@ -170,7 +224,7 @@ class CrosswordCreator():
             (x, y) = q.popleft()
             if self.revise(x, y):
                 # print(x)
-                if len(self.domains[x]) == 0:
+                if not self.domains[x]:
                     return False
                 for z in self.crossword.neighbors(x):
                     # print(2)
@@ -217,24 +271,28 @@ class CrosswordCreator():
         the number of values they rule out for neighboring variables.
         The first value in the list, for example, should be the one
         that rules out the fewest values among the neighbors of `var`.
+
+        A value rules out the words of a neighbor's domain that do not
+        share its letter on the overlap, which the support counts give
+        directly; ties are broken alphabetically.
         """
-        domains = list(self.domains[var])
-        count = 0
-        key = list()
-        for d in domains:
-            for v in self.crossword.neighbors(var):
-                if v not in assignment:
-                    overlap = self.crossword.overlaps.get((var, v))
-                    if overlap:
-                        i, j = overlap
-                        for dom in self.domains[v]:
-                            if d[i] != dom[j]:
-                                count += 1
-            key.append(count)
+        if self.supports is None:
+            self.count_supports()
+        neighbors = [
+            (i, self.supports[v][j], len(self.domains[v]))
+            for v, (i, j) in self.crossword.adjacency[var].items()
+            if v not in assignment
+        ]
+
+        def ruled_out(value):
             count = 0
+            for i, counts, size in neighbors:
+                count += size - counts[value[i]]
+            return count
 
-        domains = [items for key, items in sorted(zip(key, domains))]
-        return domains
+        return sorted(self.domains[var], key=lambda value: (
+            ruled_out(value), value
+        ))
 
 
     def select_unassigned_variable(self, assignment):
@@ -280,66 +338,78 @@ class CrosswordCreator():
         crossword and return a complete assignment if possible to do so.
 
         `assignment` is a mapping from variables (keys) to words (values).
+        It is extended in place, and domains are only ever pruned through
+        the trail, so backing out of a value undoes both without copying.
 
         If no assignment is possible, return None.
         """
         if self.assignment_complete(assignment):
             return assignment
         var = self.select_unassigned_variable(assignment)
-        for values in self.order_domain_values(var, assignment):
-            assign = assignment.copy()
-            assign[var] = values
-            if self.consistent(assign):
-                inferences = self.inferences(assign, var)
+        for value in self.order_domain_values(var, assignment):
+            assignment[var] = value
+            if self.consistent(assignment):
+                mark = len(self.trail)
+                inferences = self.inferences(assignment, var)
                 if inferences is not None:
-                    assign.update(inferences)
-
-                    result = self.backtrack(assign)
-                    if result is not None:
-                        return result
+                    assignment.update(inferences)
+                    if self.consistent(assignment):
+                        result = self.backtrack(assignment)
+                        if result is not None:
+                            return result
+                    for v in inferences:
+                        del assignment[v]
+                self.undo(mark)
+            del assignment[var]
         return None
 
-
     def inferences(self, assignment, var):
-        domain_copy = {
-            v: self.domains[v].copy()
-            for v in self.crossword.variables
-        }
-        original_domains = self.domains
-        self.domains = domain_copy
+        """
+        Maintain arc consistency after assigning `var`, pruning the domains
+        of its neighbors (and theirs, and so on) through the trail.
 
-        res = {}
-        arcs = list()
-        value = assignment[var]
-        neighbors = list(self.crossword.neighbors(var))
-        for v in neighbors:
-            arcs.append((v, var))
-
-        if self.ac3(arcs) is False:
-            self.domains = original_domains
+        Return a mapping of the unassigned variables left with a single
+        value to that value, or None if some domain becomes empty; the
+        caller undoes the pruning in either case when it backtracks.
+        """
+        self.restrict(var, assignment[var])
+        arcs = [(v, var) for v in self.crossword.neighbors(var)]
+        if not self.ac3(arcs):
             return None
 
+        res = {}
         for v in self.crossword.variables:
-            if v not in assignment and len(self.domains[v]) == 1:
-                res[v] = list(self.domains[v])[0]
-
-        self.domains = original_domains
+            if v not in assignment:
+                value = self.singleton(v)
+                if value is not None:
+                    res[v] = value
         return res
 
+
 def main():
 
     # Check usage
-    if len(sys.argv) not in [3, 4]:
-        sys.exit("Usage: python generate.py structure words [output]")
+    if len(sys.argv) not in [3, 4, 5]:
+        sys.exit("Usage: python generate.py structure words [output] [solver]")
 
     # Parse command-line arguments
     structure = sys.argv[1]
     words = sys.argv[2]
-    output = sys.argv[3] if len(sys.argv) == 4 else None
+    output = sys.argv[3] if len(sys.argv) >= 4 else None
+    solver = sys.argv[4] if len(sys.argv) == 5 else "sets"
 
     # Generate crossword
     crossword = Crossword(structure, words)
-    creator = CrosswordCreator(crossword)
+    if solver == "sets":
+        creator = CrosswordCreator(crossword)
+    elif solver == "bitsets":
+        from bitset import BitsetCrosswordCreator
+        creator = BitsetCrosswordCreator(crossword)
+    elif solver == "backjump":
+        from backjump import BackjumpCrosswordCreator
+        creator = BackjumpCrosswordCreator(crossword)
+    else:
+        sys.exit(f"Unknown solver: {solver}")
     assignment = creator.solve()
 
     # Print result
@@ -0,0 +1,150 @@
+import functools
+import multiprocessing
+import random
+import sys
+import time
+
+from crossword import *
+from backjump import BackjumpCrosswordCreator
+
+# Ways to break ties between variables with the fewest remaining values
+TIEBREAKS = ["degree", "random"]
+
+# Ways to order the values of a variable
+ORDERINGS = ["lcv", "random"]
+
+
+class PortfolioCrosswordCreator(BackjumpCrosswordCreator):
+
+    def __init__(self, crossword, tiebreak="degree", ordering="lcv",
+                 seed=None):
+        """
+        Create new CSP crossword generator with a configurable search
+        order. Ties between variables with the fewest remaining values go
+        to the highest degree or are broken at random, per `tiebreak`;
+        values are tried least-constraining first or in random order,
+        per `ordering`. `seed` seeds every random choice.
+        """
+        if tiebreak not in TIEBREAKS:
+            raise Exception(f"Unknown tiebreak: {tiebreak}")
+        if ordering not in ORDERINGS:
+            raise Exception(f"Unknown ordering: {ordering}")
+        super().__init__(crossword)
+        self.tiebreak = tiebreak
+        self.ordering = ordering
+        self.random = random.Random(seed)
+
+    def select_unassigned_variable(self, assignment):
+        """
+        Return an unassigned variable with the minimum number of remaining
+        values, breaking ties by `self.tiebreak` and then at random.
+        """
+        def key(var):
+            degree = len(self.crossword.neighbors(var))
+            return (
+                self.domains[var].bit_count(),
+                -degree if self.tiebreak == "degree" else 0,
+                self.random.random()
+            )
+
+        return min(
+            (var for var in self.crossword.variables if var not in assignment),
+            key=key
+        )
+
+    def order_domain_values(self, var, assignment):
+        """
+        Return a list of values in the domain of `var`, least-constraining
+        first or shuffled, per `self.ordering`.
+        """
+        if self.ordering == "lcv":
+            return super().order_domain_values(var, assignment)
+        values = self.words(var)
+        self.random.shuffle(values)
+        return values
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) not in [3, 4, 5]:
+        sys.exit("Usage: python portfolio.py structure words [output] [n]")
+
+    # Parse command-line arguments
+    structure = sys.argv[1]
+    words = sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) >= 4 else None
+    n = int(sys.argv[4]) if len(sys.argv) == 5 else None
+
+    # Generate crossword with a portfolio of solvers
+    start = time.perf_counter()
+    config, assignment = portfolio_solve(structure, words, configurations(n))
+    elapsed = time.perf_counter() - start
+    tiebreak, ordering, seed = config
+    print(f"First result in {elapsed:.3f}s from tiebreak {tiebreak}, "
+          f"ordering {ordering}, seed {seed}")
+
+    # Print result
+    creator = PortfolioCrosswordCreator(Crossword(structure, words))
+    if assignment is None:
+        print("No solution.")
+    else:
+        creator.print(assignment)
+        if output:
+            creator.save(assignment, output)
+
+
+def configurations(n=None):
+    """
+    Return a list of `n` solver configurations as tuples
+    `(tiebreak, ordering, seed)`, by default one per CPU. The first is
+    the usual degree tiebreak with least-constraining values, and the
+    rest cycle through every combination with a different seed each.
+    """
+    if n is None:
+        n = multiprocessing.cpu_count()
+    combinations = [
+        (tiebreak, ordering)
+        for ordering in ORDERINGS for tiebreak in TIEBREAKS
+    ]
+    return [
+        combinations[seed % len(combinations)] + (seed,)
+        for seed in range(n)
+    ]
+
+
+def solve(structure, words, config):
+    """
+    Solve a crossword with one configuration of `PortfolioCrosswordCreator`.
+    Return a tuple `(config, assignment)`.
+    """
+    tiebreak, ordering, seed = config
+    creator = PortfolioCrosswordCreator(
+        Crossword(structure, words), tiebreak, ordering, seed
+    )
+    return config, creator.solve()
+
+
+def portfolio_solve(structure, words, configs, processes=None):
+    """
+    Solve a crossword with every configuration in `configs` at once,
+    across a pool of `processes` worker processes (one per
+    configuration by default).
+
+    Every configuration searches completely, so the first to finish
+    decides: either it found an assignment, or there is none. The other
+    workers are then terminated. Return a tuple `(config, assignment)`
+    with the winning configuration and its assignment (None if there
+    is no solution).
+    """
+    if processes is None:
+        processes = len(configs)
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.imap_unordered(
+            functools.partial(solve, structure, words), configs
+        )
+        return next(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import pickle
+
+# Vocabularies loaded so far, by (path, modification time, size)
+LOADED = dict()
+
+
+class Vocabulary():
+
+    def __init__(self, words):
+        """
+        Index a collection of words for bitset domains.
+
+        Words of each length are numbered in sorted order, so that a set
+        of words of one length is an int whose bit k is set if it holds
+        the kth word of that length. `letters[length][position]` maps each
+        letter to the bitset of words of that length with that letter at
+        that position.
+        """
+        self.all = set(words)
+        self.words = dict()
+        for word in sorted(self.all):
+            self.words.setdefault(len(word), []).append(word)
+
+        self.index = dict()
+        self.letters = dict()
+        for length, words in self.words.items():
+            positions = [dict() for _ in range(length)]
+            for k, word in enumerate(words):
+                self.index[word] = k
+                bit = 1 << k
+                for position, letter in enumerate(word):
+                    positions[position][letter] = (
+                        positions[position].get(letter, 0) | bit
+                    )
+            self.letters[length] = positions
+
+    def domain(self, length):
+        """
+        Return the set of every word of a given length.
+        """
+        return set(self.words.get(length, []))
+
+    def full(self, length):
+        """
+        Return the bitset of every word of a given length.
+        """
+        return (1 << len(self.words.get(length, []))) - 1
+
+    def bit(self, word):
+        """
+        Return the bitset holding only `word`.
+        """
+        return 1 << self.index[word]
+
+    def mask(self, length, position, letter):
+        """
+        Return the bitset of words of a given length with `letter`
+        at `position`.
+        """
+        return self.letters[length][position].get(letter, 0)
+
+    def support(self, length, position, domain, other, other_position):
+        """
+        Return the bitset of words of `length` whose letter at `position`
+        also appears at `other_position` in some word of bitset `domain`,
+        itself over words of length `other`.
+        """
+        if length not in self.letters or other not in self.letters:
+            return 0
+        letters = self.letters[length][position]
+        support = 0
+        for letter, mask in self.letters[other][other_position].items():
+            if mask & domain and letter in letters:
+                support |= letters[letter]
+        return support
+
+    def decode(self, length, domain):
+        """
+        Return the list of words of a given length in bitset `domain`.
+        """
+        words = self.words.get(length, [])
+        bits = bin(domain)[:1:-1]
+        return [words[k] for k, bit in enumerate(bits) if bit == "1"]
+
+
+def load_vocabulary(filename, cache=None):
+    """
+    Return the `Vocabulary` of the words file `filename`, uppercased.
+
+    Each file is only read and indexed once per process. If `cache` is a
+    path, the vocabulary is also saved there with the file's path,
+    modification time and size, and read back instead of indexing the
+    words again as long as the file has not changed.
+    """
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    if key in LOADED:
+        return LOADED[key]
+
+    vocabulary = None
+    if cache is not None and os.path.exists(cache):
+        with open(cache, "rb") as f:
+            saved, vocabulary = pickle.load(f)
+        if saved != key:
+            vocabulary = None
+
+    if vocabulary is None:
+        with open(filename) as f:
+            vocabulary = Vocabulary(f.read().upper().splitlines())
+        if cache is not None:
+            with open(cache, "wb") as f:
+                pickle.dump((key, vocabulary), f)
+
+    LOADED[key] = vocabulary
+    return vocabulary
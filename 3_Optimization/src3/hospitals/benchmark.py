@@ -0,0 +1,129 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from hospitals import generate_space
+from render import Renderer
+from vectorized import neighborhood
+
+# Spaces to time, as (height, width, houses, hospitals)
+SPACES = [
+    (10, 20, 15, 3),
+    (100, 100, 500, 10),
+    (1000, 1000, 5000, 20)
+]
+
+# Most hill-climbing steps to time on each space
+STEPS = 100
+
+# Simulated annealing steps to time on each space, most of which move a
+# hospital
+ANNEAL_STEPS = 3000
+
+# Frames to render, on the smallest space
+FRAMES = 20
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    for height, width, houses, hospitals in SPACES:
+        space = generate_space(height, width, houses, hospitals, seed=0)
+        print(f"{height}x{width}, {houses} houses, {hospitals} hospitals")
+
+        # Score one full neighborhood by recomputing every cost
+        space.hospitals = space.random_hospitals()
+        start = time.perf_counter()
+        rescore_neighborhood(space)
+        elapsed = time.perf_counter() - start
+        print(f"  get_cost neighborhood: {elapsed:.4f}s per step")
+
+        # Score the same neighborhood in one NumPy call
+        start = time.perf_counter()
+        vectorized_neighborhood(space)
+        elapsed = time.perf_counter() - start
+        print(f"  get_costs neighborhood: {elapsed:.4f}s per step")
+
+        # Hill-climb with incremental costs, then with NumPy, from the
+        # same random start
+        for vectorized in [False, True]:
+            random.seed(0)
+            start = time.perf_counter()
+            space.hill_climb(maximum=STEPS, vectorized=vectorized)
+            elapsed = time.perf_counter() - start
+            name = "vectorized hill_climb" if vectorized else "hill_climb"
+            print(f"  {name}: {elapsed:.4f}s for up to {STEPS} steps, "
+                  f"cost {space.get_cost(space.hospitals)}")
+
+        # Anneal, which moves hospitals far more often than it scores them
+        random.seed(0)
+        start = time.perf_counter()
+        space.simulated_annealing(ANNEAL_STEPS)
+        elapsed = time.perf_counter() - start
+        print(f"  simulated_annealing: {elapsed:.4f}s for {ANNEAL_STEPS} "
+              f"steps, cost {space.get_cost(space.hospitals)}")
+
+    # Render frames, redrawing everything each time, then incrementally
+    height, width, houses, hospitals = SPACES[0]
+    space = generate_space(height, width, houses, hospitals, seed=0)
+    print(f"{FRAMES} frames of {height}x{width}")
+    directory = tempfile.mkdtemp()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        space.hospitals = space.random_hospitals()
+        space.output_image(os.path.join(directory, f"full{i}.png"))
+    elapsed = time.perf_counter() - start
+    print(f"  output_image: {elapsed / FRAMES:.4f}s per frame")
+    for threaded in [False, True]:
+        start = time.perf_counter()
+        renderer = Renderer(space, threaded=threaded)
+        for i in range(FRAMES):
+            space.hospitals = space.random_hospitals()
+            renderer.output(os.path.join(directory, f"frame{i}.png"))
+        elapsed = time.perf_counter() - start
+        renderer.close()
+        total = time.perf_counter() - start
+        name = "threaded Renderer" if threaded else "Renderer"
+        print(f"  {name}: {elapsed / FRAMES:.4f}s per frame, "
+              f"{total / FRAMES:.4f}s per frame written")
+    shutil.rmtree(directory)
+
+
+def rescore_neighborhood(space):
+    """
+    Return the lowest cost among the neighbors of the current hospitals,
+    computing each neighbor's cost from scratch with `get_cost`.
+    """
+    best = None
+    for hospital in space.hospitals:
+        for replacement in space.get_neighbors(*hospital):
+            neighbor = space.hospitals.copy()
+            neighbor.remove(hospital)
+            neighbor.add(replacement)
+            cost = space.get_cost(neighbor)
+            if best is None or cost < best:
+                best = cost
+    return best
+
+
+def vectorized_neighborhood(space):
+    """
+    Return the lowest cost among the neighbors of the current hospitals,
+    scoring every neighbor at once with `get_costs`.
+    """
+    moves = [
+        (hospital, replacement)
+        for hospital in space.hospitals
+        for replacement in space.get_neighbors(*hospital)
+    ]
+    space.array_cost = None
+    candidates = neighborhood(list(space.hospitals), moves)
+    return int(space.get_costs(candidates).min())
+
+
+if __name__ == "__main__":
+    main()
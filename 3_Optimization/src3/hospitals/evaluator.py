@@ -0,0 +1,205 @@
+import itertools
+import math
+
+# Houses per cell of the spatial index of houses, on average
+BUCKET_HOUSES = 16
+
+
+class CostEvaluator():
+
+    def __init__(self, houses, hospitals):
+        """
+        Track the cost of a set of hospitals (the sum of distances from
+        houses to their nearest hospital) as hospitals move one at a time.
+
+        For each house, keep the distance to its nearest hospital and the
+        second-smallest distance to any hospital (equal to the first on a
+        tie). Each hospital keeps the houses it is nearest to, and those
+        it is nearest or second nearest to, ties included, so that moving
+        it away only affects those houses. The houses are also bucketed
+        into square cells of the grid, each with an upper bound on the
+        second-smallest distances of its houses, to find the houses a
+        hospital's new cell may come closer to without checking every
+        house.
+        """
+        self.houses = list(houses)
+        self.hospitals = set(hospitals)
+        self.nearest = [0] * len(self.houses)
+        self.second = [0] * len(self.houses)
+
+        # Houses each hospital is at the smallest distance of, and within
+        # the second-smallest distance of. These may also hold houses it
+        # is no longer that close to, which are dropped when it moves
+        self.owners = {hospital: set() for hospital in self.hospitals}
+        self.near = {hospital: set() for hospital in self.hospitals}
+
+        # Square buckets of houses, sized to hold BUCKET_HOUSES on average
+        rows = [row for row, _ in self.houses] or [0]
+        cols = [col for _, col in self.houses] or [0]
+        area = (max(rows) - min(rows) + 1) * (max(cols) - min(cols) + 1)
+        self.size = max(1, math.ceil(math.sqrt(
+            area * BUCKET_HOUSES / max(1, len(self.houses))
+        )))
+        self.buckets = {}
+        for i, (row, col) in enumerate(self.houses):
+            key = (row // self.size, col // self.size)
+            self.buckets.setdefault(key, []).append(i)
+
+        for i in range(len(self.houses)):
+            self.update(i)
+        self.bounds = {
+            key: max(self.second[i] for i in houses)
+            for key, houses in self.buckets.items()
+        }
+        self.cost = sum(self.nearest)
+
+    def update(self, i):
+        """
+        Recompute the nearest and second-nearest distances of house `i`
+        from every hospital, and add it to the hospitals it is near.
+        """
+        row, col = self.houses[i]
+        distances = [
+            (abs(row - hospital[0]) + abs(col - hospital[1]), hospital)
+            for hospital in self.hospitals
+        ]
+        nearest = second = math.inf
+        for distance, _ in distances:
+            if distance < nearest:
+                nearest, second = distance, nearest
+            elif distance < second:
+                second = distance
+        self.nearest[i] = nearest
+        self.second[i] = second
+        for distance, hospital in distances:
+            if distance <= second:
+                self.near[hospital].add(i)
+                if distance == nearest:
+                    self.owners[hospital].add(i)
+
+    def attach(self, i, hospital, distance):
+        """
+        Add house `i` to the houses `hospital`, at distance `distance`
+        from it, is nearest or near to.
+        """
+        if distance <= self.second[i]:
+            self.near[hospital].add(i)
+            if distance == self.nearest[i]:
+                self.owners[hospital].add(i)
+
+    def closer(self, cell, strict):
+        """
+        Yield each bucket whose houses may be closer to `cell` than their
+        second-nearest hospital (or as close, unless `strict`), with its
+        houses.
+        """
+        row, col = cell
+        for key, houses in self.buckets.items():
+            top = key[0] * self.size
+            left = key[1] * self.size
+            distance = (
+                max(0, top - row, row - (top + self.size - 1)) +
+                max(0, left - col, col - (left + self.size - 1))
+            )
+            bound = self.bounds[key]
+            if distance < bound or (distance == bound and not strict):
+                yield key, houses
+
+    def delta(self, old, new):
+        """
+        Return the change in cost from moving the hospital at `old`
+        to the empty cell `new`.
+
+        Only houses `old` owns can get farther from their nearest
+        hospital. A house it does not own is at least one step further
+        from it than from its nearest hospital, so when `new` is next to
+        `old` it cannot get closer, and only the houses `old` owns are
+        checked. Any other move also checks the buckets of houses `new`
+        may be closer to than their nearest hospital, which costs more
+        the farther houses are from their second-nearest hospital, but
+        does not check every house.
+        """
+        owned = self.owners[old]
+        houses = owned
+        if abs(old[0] - new[0]) + abs(old[1] - new[1]) != 1:
+            houses = itertools.chain(owned, (
+                i for _, bucket in self.closer(new, strict=True)
+                for i in bucket if i not in owned
+            ))
+
+        delta = 0
+        for i in houses:
+            row, col = self.houses[i]
+            nearest = self.nearest[i]
+            before = abs(row - old[0]) + abs(col - old[1])
+            distance = abs(row - new[0]) + abs(col - new[1])
+            other = self.second[i] if before == nearest else nearest
+            delta += min(distance, other) - nearest
+        return delta
+
+    def move(self, old, new):
+        """
+        Move the hospital at `old` to the empty cell `new`,
+        updating the cost and every house it affects.
+
+        Houses near `old` are recomputed from every hospital only when
+        `old` was one of their two nearest, `new` is farther and some
+        other hospital may now be nearer than it; every other affected
+        house only slots the new distance in.
+        """
+        self.cost += self.delta(old, new)
+        near = self.near.pop(old)
+        del self.owners[old]
+        self.hospitals.remove(old)
+        self.hospitals.add(new)
+        self.near[new] = set()
+        self.owners[new] = set()
+
+        # Houses the hospital moved away from, or toward
+        for i in near:
+            row, col = self.houses[i]
+            before = abs(row - old[0]) + abs(col - old[1])
+            distance = abs(row - new[0]) + abs(col - new[1])
+
+            # It was no longer one of the two nearest
+            if before > self.second[i]:
+                self.insert(i, new, distance)
+
+            # The only nearest hospital is still nearer than the second
+            elif before == self.nearest[i] and distance < self.second[i]:
+                self.nearest[i] = distance
+                self.attach(i, new, distance)
+
+            # Otherwise a farther hospital may take its place
+            elif distance > before:
+                self.update(i)
+                key = (row // self.size, col // self.size)
+                self.bounds[key] = max(self.bounds[key], self.second[i])
+
+            # Or it came closer, taking the place of its old distance
+            else:
+                self.nearest[i], self.second[i] = sorted(
+                    (self.nearest[i], distance)
+                )
+                self.attach(i, new, distance)
+
+        # Houses the new cell may be at least as close to as their second
+        # nearest hospital, after which each bucket's bound is exact
+        for key, houses in list(self.closer(new, strict=False)):
+            for i in houses:
+                if i not in near:
+                    row, col = self.houses[i]
+                    distance = abs(row - new[0]) + abs(col - new[1])
+                    self.insert(i, new, distance)
+            self.bounds[key] = max(self.second[i] for i in houses)
+
+    def insert(self, i, hospital, distance):
+        """
+        Slot the distance `distance` from the moved `hospital` into house
+        `i`'s two smallest distances, which its old cell was not one of.
+        """
+        if distance < self.nearest[i]:
+            self.nearest[i], self.second[i] = distance, self.nearest[i]
+        elif distance < self.second[i]:
+            self.second[i] = distance
+        self.attach(i, hospital, distance)
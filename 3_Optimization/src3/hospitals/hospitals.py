@@ -1,4 +1,34 @@
+import math
 import random
+import time
+
+from evaluator import CostEvaluator
+
+# Temperature at the last annealing step, as a fraction of the initial one,
+# for the exponential schedule
+FINAL_RATIO = 0.001
+
+
+def linear_schedule(step, maximum, initial):
+    """Cools from the initial temperature to zero at a constant rate."""
+    return initial * (1 - step / maximum)
+
+
+def exponential_schedule(step, maximum, initial):
+    """Cools by a constant factor each step, down to FINAL_RATIO."""
+    return initial * FINAL_RATIO ** (step / maximum)
+
+
+def logarithmic_schedule(step, maximum, initial):
+    """Cools in proportion to the inverse logarithm of the step."""
+    return initial / math.log(step + math.e)
+
+
+SCHEDULES = {
+    "linear": linear_schedule,
+    "exponential": exponential_schedule,
+    "logarithmic": logarithmic_schedule
+}
 
 
 class Space():
@@ -10,10 +40,12 @@ class Space():
         self.num_hospitals = num_hospitals
         self.houses = set()
         self.hospitals = set()
+        self.array_cost = None
 
     def add_house(self, row, col):
         """Add a house at a particular location in state space."""
         self.houses.add((row, col))
+        self.array_cost = None
 
     def available_spaces(self):
         """Returns all cells not currently used by a house or hospital."""
@@ -32,18 +64,27 @@ class Space():
             candidates.remove(hospital)
         return candidates
 
-    def hill_climb(self, maximum=None, image_prefix=None, log=False):
-        """Performs hill-climbing to find a solution."""
+    def hill_climb(self, maximum=None, image_prefix=None, log=False,
+                   vectorized=False, animation=None):
+        """
+        Performs hill-climbing to find a solution. Neighbors are scored by
+        incremental cost updates, or all at once with NumPy if `vectorized`.
+        Each step is saved as an image if `image_prefix` is given, and as a
+        frame of an animated GIF or PNG if `animation` is a filename.
+        """
         count = 0
 
         # Start by initializing hospitals randomly
-        self.hospitals = set()
-        for i in range(self.num_hospitals):
-            self.hospitals.add(random.choice(list(self.available_spaces())))
+        evaluator = CostEvaluator(self.houses, self.random_hospitals())
+        self.hospitals = evaluator.hospitals
         if log:
-            print("Initial state: cost", self.get_cost(self.hospitals))
-        if image_prefix:
-            self.output_image(f"{image_prefix}{str(count).zfill(3)}.png")
+            print("Initial state: cost", evaluator.cost)
+        renderer = None
+        if image_prefix or animation:
+            from render import Renderer
+            renderer = Renderer(self, animation=animation)
+            renderer.output(self.frame_name(image_prefix, count),
+                            evaluator.cost)
 
         # Continue until we reach maximum number of iterations
         while maximum is None or count < maximum:
@@ -51,43 +92,135 @@ class Space():
             best_neighbors = []
             best_neighbor_cost = None
 
-            # Consider all hospitals to move
-            for hospital in self.hospitals:
-
-                # Consider all neighbors for that hospital
-                for replacement in self.get_neighbors(*hospital):
-
-                    # Generate a neighboring set of hospitals
-                    neighbor = self.hospitals.copy()
-                    neighbor.remove(hospital)
-                    neighbor.add(replacement)
+            # Consider all neighbors of all hospitals
+            moves = [
+                (hospital, replacement)
+                for hospital in self.hospitals
+                for replacement in self.get_neighbors(*hospital)
+            ]
+
+            # Score every neighboring set of hospitals in one array
+            # operation, or by updating the cost for the houses it affects
+            if vectorized and moves:
+                from vectorized import neighborhood
+                costs = self.get_costs(
+                    neighborhood(list(self.hospitals), moves)
+                ).tolist()
+            else:
+                costs = [
+                    evaluator.cost + evaluator.delta(hospital, replacement)
+                    for hospital, replacement in moves
+                ]
 
-                    # Check if neighbor is best so far
-                    cost = self.get_cost(neighbor)
-                    if best_neighbor_cost is None or cost < best_neighbor_cost:
-                        best_neighbor_cost = cost
-                        best_neighbors = [neighbor]
-                    elif best_neighbor_cost == cost:
-                        best_neighbors.append(neighbor)
+            # Keep the best neighbors
+            for move, cost in zip(moves, costs):
+                if best_neighbor_cost is None or cost < best_neighbor_cost:
+                    best_neighbor_cost = cost
+                    best_neighbors = [move]
+                elif best_neighbor_cost == cost:
+                    best_neighbors.append(move)
 
             # None of the neighbors are better than the current state
-            if best_neighbor_cost >= self.get_cost(self.hospitals):
-                return self.hospitals
+            if (best_neighbor_cost is None
+                    or best_neighbor_cost >= evaluator.cost):
+                break
 
             # Move to a highest-valued neighbor
             else:
                 if log:
                     print(f"Found better neighbor: cost {best_neighbor_cost}")
-                self.hospitals = random.choice(best_neighbors)
+                hospital, replacement = random.choice(best_neighbors)
+                evaluator.move(hospital, replacement)
 
             # Generate image
-            if image_prefix:
-                self.output_image(f"{image_prefix}{str(count).zfill(3)}.png")
+            if renderer:
+                renderer.output(self.frame_name(image_prefix, count),
+                                evaluator.cost)
+
+        if renderer:
+            renderer.close()
+        return self.hospitals
+
+    def simulated_annealing(self, maximum, schedule="exponential",
+                            temperature=None, log=False, trace=None):
+        """
+        Performs simulated annealing for `maximum` steps to find a solution.
+        `schedule` names one of SCHEDULES, or is a function of the step,
+        `maximum` and the initial `temperature`, which defaults to the
+        average number of houses per hospital (roughly the most one step
+        of a hospital can change the cost). If `trace` is a list, a tuple
+        `(time, cost)` is appended to it each time the best cost improves.
+        """
+        if isinstance(schedule, str):
+            if schedule not in SCHEDULES:
+                raise Exception(f"Unknown schedule: {schedule}")
+            schedule = SCHEDULES[schedule]
+        if temperature is None:
+            temperature = max(1, len(self.houses) / self.num_hospitals)
 
-    def random_restart(self, maximum, image_prefix=None, log=False):
+        # Start by initializing hospitals randomly
+        evaluator = CostEvaluator(self.houses, self.random_hospitals())
+        self.hospitals = evaluator.hospitals
+        best_hospitals = set(self.hospitals)
+        best_cost = evaluator.cost
+        if log:
+            print("Initial state: cost", best_cost)
+        if trace is not None:
+            trace.append((time.time(), best_cost))
+
+        for step in range(maximum):
+            t = schedule(step, maximum, temperature)
+
+            # Pick a random neighbor
+            hospital = random.choice(list(self.hospitals))
+            neighbors = self.get_neighbors(*hospital)
+            if not neighbors:
+                continue
+            replacement = random.choice(neighbors)
+
+            # Always move to a better neighbor, and to a worse one with a
+            # probability that falls as it gets worse and as it gets colder
+            delta = evaluator.delta(hospital, replacement)
+            if delta > 0:
+                if t <= 0 or random.random() >= math.exp(-delta / t):
+                    continue
+            evaluator.move(hospital, replacement)
+
+            if evaluator.cost < best_cost:
+                best_cost = evaluator.cost
+                best_hospitals = set(self.hospitals)
+                if log:
+                    print(f"{step}: Found new best state: cost {best_cost}")
+                if trace is not None:
+                    trace.append((time.time(), best_cost))
+
+        self.hospitals = best_hospitals
+        return self.hospitals
+
+    def random_hospitals(self):
+        """Returns random cells for all hospitals, avoiding houses."""
+        if self.height * self.width - len(self.houses) < self.num_hospitals:
+            raise Exception("Not enough space for hospitals")
+        # Draw cells until they are free, rather than listing every cell
+        hospitals = set()
+        while len(hospitals) < self.num_hospitals:
+            cell = (
+                random.randrange(self.height),
+                random.randrange(self.width)
+            )
+            if cell not in self.houses:
+                hospitals.add(cell)
+        return hospitals
+
+    def random_restart(self, maximum, image_prefix=None, log=False,
+                       animation=None):
         """Repeats hill-climbing multiple times."""
         best_hospitals = None
         best_cost = None
+        renderer = None
+        if image_prefix or animation:
+            from render import Renderer
+            renderer = Renderer(self, animation=animation)
 
         # Repeat hill-climbing a fixed number of times
         for i in range(maximum):
@@ -102,9 +235,11 @@ class Space():
                 if log:
                     print(f"{i}: Found state: cost {cost}")
 
-            if image_prefix:
-                self.output_image(f"{image_prefix}{str(i).zfill(3)}.png")
+            if renderer:
+                renderer.output(self.frame_name(image_prefix, i), cost)
 
+        if renderer:
+            renderer.close()
         return best_hospitals
 
     def get_cost(self, hospitals):
@@ -117,6 +252,19 @@ class Space():
             )
         return cost
 
+    def get_costs(self, candidates):
+        """
+        Calculates the costs of many sets of hospitals at once with NumPy.
+        `candidates` is a list of sets of hospitals, all the same size,
+        or an array of shape (candidates x hospitals x 2).
+        """
+        from vectorized import ArrayCost
+        if self.array_cost is None:
+            self.array_cost = ArrayCost(self.houses)
+        if not hasattr(candidates, "shape"):
+            candidates = [sorted(hospitals) for hospitals in candidates]
+        return self.array_cost.costs(candidates)
+
     def get_neighbors(self, row, col):
         """Returns neighbors not already containing a house or hospital."""
         candidates = [
@@ -133,67 +281,35 @@ class Space():
                 neighbors.append((r, c))
         return neighbors
 
+    def frame_name(self, image_prefix, count):
+        """Returns the filename of an image, or None without a prefix."""
+        if image_prefix:
+            return f"{image_prefix}{str(count).zfill(3)}.png"
+        return None
+
     def output_image(self, filename):
         """Generates image with all houses and hospitals."""
-        from PIL import Image, ImageDraw, ImageFont
-        cell_size = 100
-        cell_border = 2
-        cost_size = 40
-        padding = 10
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size,
-             self.height * cell_size + cost_size + padding * 2),
-            "white"
-        )
-        house = Image.open("assets/images/House.png").resize(
-            (cell_size, cell_size)
-        )
-        hospital = Image.open("assets/images/Hospital.png").resize(
-            (cell_size, cell_size)
-        )
-        font = ImageFont.truetype("assets/fonts/OpenSans-Regular.ttf", 30)
-        draw = ImageDraw.Draw(img)
-
-        for i in range(self.height):
-            for j in range(self.width):
-
-                # Draw cell
-                rect = [
-                    (j * cell_size + cell_border,
-                     i * cell_size + cell_border),
-                    ((j + 1) * cell_size - cell_border,
-                     (i + 1) * cell_size - cell_border)
-                ]
-                draw.rectangle(rect, fill="black")
-
-                if (i, j) in self.houses:
-                    img.paste(house, rect[0], house)
-                if (i, j) in self.hospitals:
-                    img.paste(hospital, rect[0], hospital)
-
-        # Add cost
-        draw.rectangle(
-            (0, self.height * cell_size, self.width * cell_size,
-             self.height * cell_size + cost_size + padding * 2),
-            "black"
-        )
-        draw.text(
-            (padding, self.height * cell_size + padding),
-            f"Cost: {self.get_cost(self.hospitals)}",
-            fill="white",
-            font=font
-        )
+        from render import Renderer
+        renderer = Renderer(self, threaded=False)
+        renderer.output(filename)
+        renderer.close()
+
+
+def generate_space(height, width, houses, hospitals, seed=None):
+    """Returns a space with `houses` houses at distinct random cells."""
+    rng = random.Random(seed)
+    space = Space(height, width, hospitals)
+    while len(space.houses) < houses:
+        space.add_house(rng.randrange(height), rng.randrange(width))
+    return space
 
-        img.save(filename)
 
+if __name__ == "__main__":
 
-# Create a new space and add houses randomly
-s = Space(height=10, width=20, num_hospitals=3)
-for i in range(15):
-    s.add_house(random.randrange(s.height), random.randrange(s.width))
+    # Create a new space and add houses randomly
+    s = Space(height=10, width=20, num_hospitals=3)
+    for i in range(15):
+        s.add_house(random.randrange(s.height), random.randrange(s.width))
 
-# Use local search to determine hospital placement
-hospitals = s.hill_climb(image_prefix="hospitals", log=True)
+    # Use local search to determine hospital placement
+    hospitals = s.hill_climb(image_prefix="hospitals", log=True)
@@ -0,0 +1,107 @@
+import functools
+import multiprocessing
+import random
+import sys
+import time
+
+from hospitals import SCHEDULES, generate_space
+
+# Space to search, as (height, width, houses, hospitals)
+SPACE = (100, 100, 500, 10)
+
+# Steps of each simulated annealing chain
+STEPS = 5000
+
+# Ways to search, each run once per seed
+METHODS = ["restarts", "annealing"]
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) not in [3, 4, 5]:
+        sys.exit("Usage: python parallel.py method runs "
+                 "[processes] [schedule]")
+
+    # Parse command-line arguments
+    method = sys.argv[1]
+    runs = int(sys.argv[2])
+    processes = int(sys.argv[3]) if len(sys.argv) >= 4 else None
+    schedule = sys.argv[4] if len(sys.argv) == 5 else "exponential"
+    if method not in METHODS:
+        sys.exit(f"Method must be one of {', '.join(METHODS)}")
+    if schedule not in SCHEDULES:
+        sys.exit(f"Schedule must be one of {', '.join(SCHEDULES)}")
+
+    height, width, houses, hospitals = SPACE
+    space = generate_space(height, width, houses, hospitals, seed=0)
+    print(f"{height}x{width}, {houses} houses, {hospitals} hospitals: "
+          f"{runs} {method} runs")
+
+    # Search, and report how the best cost fell over time
+    options = {}
+    if method == "annealing":
+        options = {"maximum": STEPS, "schedule": schedule}
+    start = time.perf_counter()
+    best, cost, points = parallel_search(
+        space, method, range(runs), processes, **options
+    )
+    elapsed = time.perf_counter() - start
+    for seconds, point in points:
+        print(f"  {seconds:8.3f}s: cost {point}")
+    print(f"Best cost {cost} in {elapsed:.3f}s")
+
+
+def search(space, method, options, start, seed):
+    """
+    Search `space` once by `method`, seeding the random choices with
+    `seed`, passing `options` to simulated annealing. Return a tuple
+    `(hospitals, cost, trace)` where `trace` lists tuples
+    `(seconds, cost)` since `start` whenever the best cost improved.
+    """
+    random.seed(seed)
+    trace = []
+    if method == "restarts":
+        hospitals = space.hill_climb()
+        trace.append((time.time(), space.get_cost(hospitals)))
+    elif method == "annealing":
+        hospitals = space.simulated_annealing(trace=trace, **options)
+    else:
+        raise Exception(f"Unknown method: {method}")
+    trace = [(moment - start, cost) for moment, cost in trace]
+    return hospitals, space.get_cost(hospitals), trace
+
+
+def parallel_search(space, method, seeds, processes=None, **options):
+    """
+    Search `space` by `method` once per seed in `seeds`, across a pool of
+    `processes` worker processes (one per CPU by default), passing
+    `options` to simulated annealing.
+
+    Return a tuple `(hospitals, cost, curve)` with the best hospitals
+    found, their cost, and the best cost over all runs as a list of
+    tuples `(seconds, cost)`, one per improvement.
+    """
+    start = time.time()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(
+            functools.partial(search, space, method, options, start), seeds
+        )
+    best, cost, _ = min(results, key=lambda result: result[1])
+    return best, cost, curve(trace for _, _, trace in results)
+
+
+def curve(traces):
+    """
+    Merge the `(seconds, cost)` traces of many runs into a single curve
+    of the best cost found by any of them over time.
+    """
+    points = []
+    for seconds, cost in sorted(point for trace in traces for point in trace):
+        if not points or cost < points[-1][1]:
+            points.append((seconds, cost))
+    return points
+
+
+if __name__ == "__main__":
+    main()
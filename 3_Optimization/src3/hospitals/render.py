@@ -0,0 +1,143 @@
+import concurrent.futures
+
+from PIL import Image, ImageDraw, ImageFont
+
+CELL_SIZE = 100
+CELL_BORDER = 2
+COST_SIZE = 40
+PADDING = 10
+
+# zlib level frames are saved with, trading file size for encoding time
+COMPRESS_LEVEL = 1
+
+# Milliseconds each frame of an animation is shown for
+DURATION = 500
+
+
+class Renderer():
+
+    def __init__(self, space, animation=None, threaded=True):
+        """
+        Render images of the houses and hospitals in `space`.
+
+        The sprites, font and background (every cell and house, which do
+        not move) are prepared once. Each frame then only restores the
+        cells hospitals left and pastes the cells they moved to.
+
+        Frames saved to files are written on a background thread if
+        `threaded`. If `animation` is a filename, every frame is also
+        kept and written on `close` as an animated GIF, or an animated
+        PNG if the filename ends in `.png`.
+        """
+        self.space = space
+        self.animation = animation
+        self.frames = []
+        self.writer = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            if threaded else None
+        )
+        self.pending = []
+
+        # Load and resize the sprites and font once
+        size = (CELL_SIZE, CELL_SIZE)
+        self.house = Image.open("assets/images/House.png").resize(size)
+        self.hospital = Image.open("assets/images/Hospital.png").resize(size)
+        self.font = ImageFont.truetype("assets/fonts/OpenSans-Regular.ttf", 30)
+
+        # Draw the static background: every cell, and the houses
+        self.background = Image.new(
+            "RGBA",
+            (space.width * CELL_SIZE,
+             space.height * CELL_SIZE + COST_SIZE + PADDING * 2),
+            "white"
+        )
+        draw = ImageDraw.Draw(self.background)
+        for i in range(space.height):
+            for j in range(space.width):
+                draw.rectangle(self.cell(i, j), fill="black")
+        for i, j in space.houses:
+            self.background.paste(
+                self.house, self.cell(i, j)[:2], self.house
+            )
+
+        # The canvas starts out with no hospitals drawn
+        self.canvas = self.background.copy()
+        self.draw = ImageDraw.Draw(self.canvas)
+        self.drawn = set()
+
+    def cell(self, i, j):
+        """Return the box (left, top, right, bottom) inside cell (i, j)."""
+        return (
+            j * CELL_SIZE + CELL_BORDER,
+            i * CELL_SIZE + CELL_BORDER,
+            (j + 1) * CELL_SIZE - CELL_BORDER,
+            (i + 1) * CELL_SIZE - CELL_BORDER
+        )
+
+    def render(self, cost=None):
+        """
+        Draw the current hospitals of the space, and `cost` (by default
+        the cost of those hospitals), onto the canvas and return it.
+        """
+        hospitals = set(self.space.hospitals)
+        if cost is None:
+            cost = self.space.get_cost(hospitals)
+
+        # Restore the cells hospitals left, and draw the ones they moved to
+        for i, j in self.drawn - hospitals:
+            box = self.cell(i, j)
+            self.canvas.paste(self.background.crop(box), box[:2])
+        for i, j in hospitals - self.drawn:
+            self.canvas.paste(
+                self.hospital, self.cell(i, j)[:2], self.hospital
+            )
+        self.drawn = hospitals
+
+        # Redraw the cost
+        top = self.space.height * CELL_SIZE
+        self.draw.rectangle(
+            (0, top, self.space.width * CELL_SIZE,
+             top + COST_SIZE + PADDING * 2),
+            "black"
+        )
+        self.draw.text(
+            (PADDING, top + PADDING),
+            f"Cost: {cost}",
+            fill="white",
+            font=self.font
+        )
+        return self.canvas
+
+    def output(self, filename=None, cost=None):
+        """
+        Render a frame, saving it to `filename` if given and adding it to
+        the animation if there is one.
+        """
+        self.render(cost)
+        if self.animation:
+            self.frames.append(self.canvas.copy())
+        if filename:
+            frame = self.canvas.copy()
+            if self.writer:
+                self.pending.append(self.writer.submit(
+                    frame.save, filename, compress_level=COMPRESS_LEVEL
+                ))
+            else:
+                frame.save(filename, compress_level=COMPRESS_LEVEL)
+
+    def close(self):
+        """Wait for every frame to be written, and write the animation."""
+        if self.writer:
+            self.writer.shutdown(wait=True)
+            for future in self.pending:
+                future.result()
+            self.pending = []
+        if self.animation and self.frames:
+            self.frames[0].save(
+                self.animation,
+                save_all=True,
+                append_images=self.frames[1:],
+                duration=DURATION,
+                loop=0
+            )
+            self.frames = []
@@ -0,0 +1,60 @@
+import numpy as np
+
+# Most elements of the (candidates x houses x hospitals) distance tensor
+# held in memory at once
+CHUNK = 2 ** 22
+
+
+class ArrayCost():
+
+    def __init__(self, houses):
+        """
+        Hold house locations as coordinate arrays, to score many sets of
+        hospitals at once with NumPy broadcasting.
+        """
+        houses = np.array(sorted(houses), dtype=np.int32).reshape(-1, 2)
+        self.rows = houses[:, 0]
+        self.cols = houses[:, 1]
+
+    def costs(self, candidates, chunk=CHUNK):
+        """
+        Return an array with the cost of each set of hospitals in
+        `candidates`, an array of shape (candidates x hospitals x 2)
+        holding the (row, col) of every hospital of every set.
+
+        The Manhattan distance from every house to every hospital of a
+        set is one broadcast over a (candidates x houses x hospitals)
+        tensor, computed a slice of candidates at a time so that no more
+        than `chunk` distances are held at once.
+        """
+        candidates = np.asarray(candidates, dtype=np.int32)
+        count, hospitals, _ = candidates.shape
+        step = max(1, chunk // max(1, len(self.rows) * hospitals))
+        costs = np.empty(count, dtype=np.int64)
+        for start in range(0, count, step):
+            block = candidates[start:start + step]
+            distances = np.abs(
+                self.rows[None, :, None] - block[:, None, :, 0]
+            )
+            distances += np.abs(
+                self.cols[None, :, None] - block[:, None, :, 1]
+            )
+            costs[start:start + step] = distances.min(axis=2).sum(
+                axis=1, dtype=np.int64
+            )
+        return costs
+
+
+def neighborhood(hospitals, moves):
+    """
+    Return an array of shape (len(moves) x hospitals x 2) holding, for
+    each move `(hospital, replacement)` in `moves`, the set of hospitals
+    in the list `hospitals` with that hospital moved to its replacement.
+    """
+    candidates = np.repeat(
+        np.array(hospitals, dtype=np.int32)[None], len(moves), axis=0
+    )
+    index = {hospital: i for i, hospital in enumerate(hospitals)}
+    for k, (hospital, replacement) in enumerate(moves):
+        candidates[k, index[hospital]] = replacement
+    return candidates
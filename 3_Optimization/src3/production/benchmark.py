@@ -0,0 +1,152 @@
+import random
+import sys
+import time
+
+import scipy.optimize
+
+from model import Model, SOLVERS, highspy
+
+# Production plans to time, as (products, machines, outputs)
+PLANS = [
+    (2, 1, 1),
+    (200, 50, 20),
+    (2000, 500, 200)
+]
+
+# Machines each product needs time on
+MACHINES_PER_PRODUCT = 3
+
+# Variants of each plan to solve, with costs and capacities perturbed
+VARIANTS = 200
+
+# Most each cost or capacity is perturbed by, as a fraction
+PERTURBATION = 0.1
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    for products, machines, outputs in PLANS:
+        print(f"{products} products, {machines} machines, {outputs} outputs, "
+              f"{VARIANTS} variants")
+        model = generate_plan(products, machines, outputs, seed=0)
+        variants = generate_variants(model, VARIANTS, seed=1)
+
+        # Rebuild the dense problem for every variant
+        start = time.perf_counter()
+        dense = [solve_dense(model, **variant) for variant in variants]
+        report("dense linprog", time.perf_counter() - start)
+
+        # Reuse the sparse model, with each solver, in a loop and a pool
+        for solver in SOLVERS:
+            if solver == "highspy" and highspy is None:
+                print(f"  {solver}: not installed")
+                continue
+            model.solver = solver
+            for processes in [1, None]:
+                start = time.perf_counter()
+                results = model.solve_many(variants, processes)
+                elapsed = time.perf_counter() - start
+                check(dense, results)
+                name = solver if processes == 1 else f"{solver} pool"
+                report(name, elapsed)
+
+
+def generate_plan(products, machines, outputs, seed=None):
+    """
+    Return a `Model` of a production plan, like production.py's: choose
+    hours of each product to minimize cost, within each machine's
+    capacity, while making at least the required amount of each output.
+    A random plan is made to fit, so there is always a solution.
+    """
+    rng = random.Random(seed)
+    model = Model()
+    hours = {}
+    for p in range(products):
+        model.add_variable(f"x{p}", cost=rng.randint(10, 100))
+        hours[f"x{p}"] = rng.uniform(0, 10)
+
+    # Each product needs time on a few machines, within their capacity
+    uses = [dict() for _ in range(machines)]
+    for p in range(products):
+        for m in rng.sample(range(machines), min(MACHINES_PER_PRODUCT,
+                                                 machines)):
+            uses[m][f"x{p}"] = rng.randint(1, 5)
+    for m, coefficients in enumerate(uses):
+        capacity = sum(c * hours[x] for x, c in coefficients.items())
+        model.add_constraint(f"machine{m}", coefficients,
+                             upper=1.5 * capacity)
+
+    # Each product makes a few outputs, with a required amount of each
+    yields = [dict() for _ in range(outputs)]
+    for p in range(products):
+        yields[rng.randrange(outputs)][f"x{p}"] = rng.randint(5, 15)
+    for o, coefficients in enumerate(yields):
+        required = sum(c * hours[x] for x, c in coefficients.items())
+        model.add_constraint(f"output{o}", coefficients,
+                             lower=0.8 * required)
+    return model
+
+
+def generate_variants(model, n, seed=None):
+    """
+    Return `n` variants of `model`, as dicts of keyword arguments to
+    `Model.solve`, with every cost and constraint bound perturbed by up
+    to PERTURBATION.
+    """
+    rng = random.Random(seed)
+
+    def perturb(values):
+        return [
+            value * (1 + rng.uniform(-PERTURBATION, PERTURBATION))
+            for value in values
+        ]
+
+    return [
+        {
+            "costs": perturb(model.costs),
+            "lower": perturb(model.row_lower),
+            "upper": perturb(model.row_upper)
+        }
+        for _ in range(n)
+    ]
+
+
+def solve_dense(model, costs, lower, upper):
+    """
+    Solve a variant the way production.py does, building dense
+    coefficient lists of inequalities and calling linprog.
+    """
+    dense = [[0] * len(costs) for _ in range(len(lower))]
+    for row, column, value in zip(model.rows, model.columns, model.values):
+        dense[row][column] = value
+    A_ub = []
+    b_ub = []
+    for row, coefficients in enumerate(dense):
+        if upper[row] != float("inf"):
+            A_ub.append(coefficients)
+            b_ub.append(upper[row])
+        if lower[row] != float("-inf"):
+            A_ub.append([-v for v in coefficients])
+            b_ub.append(-lower[row])
+    return scipy.optimize.linprog(costs, A_ub=A_ub, b_ub=b_ub)
+
+
+def check(expected, results):
+    """Raise an exception if two lists of results disagree."""
+    for a, b in zip(expected, results):
+        if a.success != b.success:
+            raise Exception("Solvers disagree on feasibility")
+        if a.success and abs(a.fun - b.fun) > 1e-6 * max(1, abs(a.fun)):
+            raise Exception(f"Solvers disagree on cost: {a.fun} != {b.fun}")
+
+
+def report(name, elapsed):
+    """Print how many variants were solved per second."""
+    print(f"  {name}: {elapsed:.3f}s, {VARIANTS / elapsed:.1f} solves per "
+          f"second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import math
+import multiprocessing
+import sys
+
+import numpy as np
+import scipy.optimize
+import scipy.sparse
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+# Ways to solve a model: HiGHS kept in memory between solves when highspy
+# is installed, or a fresh scipy.optimize.linprog call each time
+SOLVERS = ["highspy", "linprog"]
+
+# Model solved by each process of a pool
+MODEL = None
+
+
+class Model():
+
+    def __init__(self, solver=None):
+        """
+        Create an empty linear program, minimizing the total cost of its
+        variables. `solver` is one of SOLVERS, by default highspy if it
+        is installed.
+        """
+        if solver is None:
+            solver = "highspy" if highspy is not None else "linprog"
+        if solver not in SOLVERS:
+            raise Exception(f"Unknown solver: {solver}")
+        if solver == "highspy" and highspy is None:
+            raise Exception("highspy is not installed")
+        self.solver = solver
+
+        # Variables
+        self.variables = {}
+        self.costs = []
+        self.lower = []
+        self.upper = []
+
+        # Constraints, with their coefficients as (row, column, value)
+        self.constraints = {}
+        self.rows = []
+        self.columns = []
+        self.values = []
+        self.row_lower = []
+        self.row_upper = []
+
+        self.matrix = None
+        self.split = None
+        self.highs = None
+        self.current = None
+
+    def __getstate__(self):
+        """Leave out the HiGHS instance, which cannot be pickled."""
+        state = self.__dict__.copy()
+        state["highs"] = None
+        return state
+
+    def add_variable(self, name, cost=0, lower=0, upper=None):
+        """
+        Add a variable costing `cost` per unit, bounded by `lower` and
+        `upper` (None for no bound). Return its index.
+        """
+        if name in self.variables:
+            raise Exception(f"Duplicate variable: {name}")
+        self.variables[name] = len(self.costs)
+        self.costs.append(cost)
+        self.lower.append(-math.inf if lower is None else lower)
+        self.upper.append(math.inf if upper is None else upper)
+        self.matrix = None
+        return self.variables[name]
+
+    def add_constraint(self, name, coefficients, lower=None, upper=None):
+        """
+        Add a constraint `lower <= sum(coefficient * variable) <= upper`,
+        where `coefficients` maps variable names to their coefficients
+        and either bound may be None. Return its index.
+        """
+        if name in self.constraints:
+            raise Exception(f"Duplicate constraint: {name}")
+        row = len(self.row_lower)
+        self.constraints[name] = row
+        for variable, value in coefficients.items():
+            self.rows.append(row)
+            self.columns.append(self.variables[variable])
+            self.values.append(value)
+        self.row_lower.append(-math.inf if lower is None else lower)
+        self.row_upper.append(math.inf if upper is None else upper)
+        self.matrix = None
+        return row
+
+    def build(self):
+        """
+        Assemble the constraints into a sparse matrix, once until the
+        model changes.
+        """
+        if self.matrix is not None:
+            return
+        shape = (len(self.row_lower), len(self.costs))
+        self.matrix = scipy.sparse.csr_matrix(
+            (self.values, (self.rows, self.columns)), shape=shape
+        )
+        self.split = None
+        self.highs = None
+
+    def split_rows(self, lower, upper):
+        """
+        Return a tuple `(at_most, at_least, equal, inequalities,
+        equalities)` for linprog, given the row bounds `lower` and `upper`
+        of one solve: the indices of the rows bounded above, bounded
+        below and fixed, the matrix of `<=` rows (rows bounded below
+        negated) and the matrix of fixed rows.
+
+        The result is kept for the next solve, and reused as long as the
+        same rows have each kind of bound, as when only their values vary.
+        """
+        equal = lower == upper
+        at_most = np.isfinite(upper) & ~equal
+        at_least = np.isfinite(lower) & ~equal
+        key = (at_most.tobytes(), at_least.tobytes(), equal.tobytes())
+        if self.split is None or self.split[0] != key:
+            at_most = np.flatnonzero(at_most)
+            at_least = np.flatnonzero(at_least)
+            equal = np.flatnonzero(equal)
+            inequalities = scipy.sparse.vstack([
+                self.matrix[at_most], -self.matrix[at_least]
+            ]).tocsr()
+            self.split = (key, (
+                at_most, at_least, equal, inequalities, self.matrix[equal]
+            ))
+        return self.split[1]
+
+    def solve(self, costs=None, lower=None, upper=None):
+        """
+        Solve the model, replacing the costs of the variables with `costs`
+        and the bounds of the constraints with `lower` and `upper` if
+        given, each a sequence in the order things were added. Return a
+        scipy.optimize.OptimizeResult with `success`, `x` and `fun`.
+        """
+        self.build()
+        costs = np.asarray(self.costs if costs is None else costs, float)
+        lower = np.asarray(self.row_lower if lower is None else lower, float)
+        upper = np.asarray(self.row_upper if upper is None else upper, float)
+        if self.solver == "highspy":
+            return self.solve_highspy(costs, lower, upper)
+        return self.solve_linprog(costs, lower, upper)
+
+    def solve_linprog(self, costs, lower, upper):
+        """
+        Solve the model with a fresh call to linprog, which takes `<=` and
+        `==` rows separately, so the rows are split by the bounds given.
+        """
+        at_most, at_least, equal, inequalities, equalities = (
+            self.split_rows(lower, upper)
+        )
+        b_ub = np.concatenate([upper[at_most], -lower[at_least]])
+        return scipy.optimize.linprog(
+            costs,
+            A_ub=inequalities if len(b_ub) else None,
+            b_ub=b_ub if len(b_ub) else None,
+            A_eq=equalities if len(equal) else None,
+            b_eq=lower[equal] if len(equal) else None,
+            bounds=list(zip(self.lower, self.upper)),
+            method="highs"
+        )
+
+    def solve_highspy(self, costs, lower, upper):
+        """
+        Solve the model with HiGHS. The model is passed to HiGHS once,
+        after which only the costs and bounds that differ are changed,
+        so each solve starts from the previous solution's basis.
+        """
+        indices = np.arange(len(costs), dtype=np.int32)
+        rows = np.arange(len(lower), dtype=np.int32)
+        if self.highs is None:
+            self.highs = highspy.Highs()
+            self.highs.setOptionValue("output_flag", False)
+            matrix = self.matrix.tocsc()
+            lp = highspy.HighsLp()
+            lp.num_col_ = len(costs)
+            lp.num_row_ = len(lower)
+            lp.col_cost_ = costs
+            lp.col_lower_ = np.array(self.lower, dtype=float)
+            lp.col_upper_ = np.array(self.upper, dtype=float)
+            lp.row_lower_ = lower
+            lp.row_upper_ = upper
+            lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+            lp.a_matrix_.start_ = matrix.indptr
+            lp.a_matrix_.index_ = matrix.indices
+            lp.a_matrix_.value_ = matrix.data
+            self.highs.passModel(lp)
+            self.current = (costs, lower, upper)
+        else:
+            current_costs, current_lower, current_upper = self.current
+            if not np.array_equal(costs, current_costs):
+                self.highs.changeColsCost(len(costs), indices, costs)
+            if not (np.array_equal(lower, current_lower)
+                    and np.array_equal(upper, current_upper)):
+                self.highs.changeRowsBounds(len(rows), rows, lower, upper)
+            self.current = (costs, lower, upper)
+
+        self.highs.run()
+        status = self.highs.getModelStatus()
+        if status != highspy.HighsModelStatus.kOptimal:
+            return scipy.optimize.OptimizeResult(
+                success=False, x=None, fun=None
+            )
+        return scipy.optimize.OptimizeResult(
+            success=True,
+            x=np.array(self.highs.getSolution().col_value),
+            fun=self.highs.getInfo().objective_function_value
+        )
+
+    def solve_many(self, variants, processes=1):
+        """
+        Solve the model once per variant in `variants`, each a dict of
+        keyword arguments to `solve`. With more than one process, the
+        model is sent to each worker of a pool once and only the variants
+        are sent per solve; None means one process per CPU. Return the
+        results in order.
+        """
+        self.build()
+        if processes == 1:
+            return [self.solve(**variant) for variant in variants]
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        with multiprocessing.Pool(
+            processes, initializer=initialize, initargs=(self,)
+        ) as pool:
+            return pool.map(
+                solve_variant, variants,
+                chunksize=max(1, len(variants) // (4 * processes))
+            )
+
+
+def initialize(model):
+    """Keep the model a worker process of a pool solves."""
+    global MODEL
+    MODEL = model
+
+
+def solve_variant(variant):
+    """Solve one variant of the model of this worker process."""
+    return MODEL.solve(**variant)
+
+
+def main():
+    if len(sys.argv) not in [1, 2]:
+        sys.exit("Usage: python model.py [solver]")
+    solver = sys.argv[1] if len(sys.argv) == 2 else None
+
+    # The problem of production.py
+    model = Model(solver)
+    model.add_variable("x1", cost=50)
+    model.add_variable("x2", cost=80)
+    model.add_constraint("labor", {"x1": 5, "x2": 2}, upper=20)
+    model.add_constraint("output", {"x1": 10, "x2": 12}, lower=90)
+
+    result = model.solve()
+    if result.success:
+        print(f"X1: {round(result.x[0], 2)} hours")
+        print(f"X2: {round(result.x[1], 2)} hours")
+    else:
+        print("No solution")
+
+
+if __name__ == "__main__":
+    main()
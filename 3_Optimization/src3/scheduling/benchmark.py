@@ -0,0 +1,121 @@
+import multiprocessing
+import random
+import sys
+import time
+
+import schedule0
+from csp import CSP, INFERENCES
+
+try:
+    import constraint
+except ImportError:
+    constraint = None
+
+# Instances to time, as (exams, pairs of exams sharing a student)
+INSTANCES = [
+    (20, 40),
+    (50, 100),
+    (100, 220),
+    (200, 450),
+    (400, 800),
+    (800, 1600),
+    (1500, 3000)
+]
+
+# Days exams can be scheduled on, as in schedule0
+DAYS = ["Monday", "Tuesday", "Wednesday"]
+
+# Most seconds to give each solver on each instance
+TIME_LIMIT = 10
+
+# Solvers to compare, besides CSP with each inference
+SOLVERS = ["schedule0", "python-constraint"]
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    solvers = SOLVERS + [f"csp {inference}" for inference in INFERENCES]
+    for exams, pairs in INSTANCES:
+        variables, constraints = generate_instance(exams, pairs, seed=0)
+        print(f"{exams} exams, {len(constraints)} constraints")
+        for solver in solvers:
+            if solver == "python-constraint" and constraint is None:
+                print(f"  {solver}: not installed")
+                continue
+            result = solve_with_limit(solver, variables, constraints)
+            if result is None:
+                print(f"  {solver}: over {TIME_LIMIT}s")
+                continue
+            assignment, elapsed = result
+            check(assignment, constraints)
+            print(f"  {solver}: {elapsed:.4f}s")
+
+
+def generate_instance(exams, pairs, seed=None):
+    """
+    Return a tuple `(variables, constraints)` of a random exam scheduling
+    problem, that is a graph coloring with one color per day. Exams are
+    secretly given days first, and only exams on different days share
+    students, so the problem always has a solution.
+    """
+    rng = random.Random(seed)
+    variables = [f"E{i}" for i in range(exams)]
+    days = {var: rng.randrange(len(DAYS)) for var in variables}
+    constraints = set()
+    while len(constraints) < pairs:
+        x, y = rng.sample(variables, 2)
+        if days[x] != days[y] and (y, x) not in constraints:
+            constraints.add((x, y))
+    return variables, sorted(constraints)
+
+
+def solve(solver, variables, constraints):
+    """
+    Solve an instance with `solver`. Return a tuple
+    `(assignment, elapsed)` with the assignment found and the seconds
+    taken.
+    """
+    start = time.perf_counter()
+    if solver == "schedule0":
+        sys.setrecursionlimit(max(1000, 2 * len(variables)))
+        schedule0.VARIABLES = variables
+        schedule0.CONSTRAINTS = constraints
+        assignment = schedule0.backtrack(dict())
+    elif solver == "python-constraint":
+        problem = constraint.Problem()
+        problem.addVariables(variables, DAYS)
+        for x, y in constraints:
+            problem.addConstraint(lambda x, y: x != y, (x, y))
+        assignment = problem.getSolution()
+    else:
+        inference = solver.split()[1]
+        assignment = CSP(variables, DAYS, constraints).solve(inference)
+    return assignment, time.perf_counter() - start
+
+
+def solve_with_limit(solver, variables, constraints):
+    """
+    Run `solve` in a separate process, returning None if it takes over
+    TIME_LIMIT seconds.
+    """
+    with multiprocessing.Pool(1) as pool:
+        result = pool.apply_async(solve, (solver, variables, constraints))
+        try:
+            return result.get(TIME_LIMIT)
+        except multiprocessing.TimeoutError:
+            return None
+
+
+def check(assignment, constraints):
+    """Raise an exception if `assignment` violates a constraint."""
+    if assignment is None:
+        raise Exception("No solution found")
+    for x, y in constraints:
+        if assignment[x] == assignment[y]:
+            raise Exception(f"{x} and {y} are on the same day")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Backtracking search with the minimum remaining values and degree
+heuristics, and either forward checking or maintaining arc consistency.
+"""
+
+import operator
+import sys
+
+from schedule0 import VARIABLES, CONSTRAINTS
+
+# Ways to infer new domains after each assignment
+INFERENCES = ["none", "forward", "mac"]
+
+
+class CSP():
+
+    def __init__(self, variables, domains, constraints,
+                 relation=operator.ne):
+        """
+        Create a new constraint satisfaction problem. `domains` is either
+        a dict mapping each variable to its values or a list of values
+        shared by every variable. Each pair `(x, y)` in `constraints`
+        requires `relation(value of x, value of y)`, by default that the
+        two values differ.
+        """
+        self.variables = list(variables)
+        if isinstance(domains, dict):
+            self.domains = {var: list(domains[var]) for var in self.variables}
+        else:
+            self.domains = {var: list(domains) for var in self.variables}
+
+        # Index the constraints on each variable by the other variable,
+        # as a relation from the first variable's value to the second's
+        self.neighbors = {var: dict() for var in self.variables}
+        for x, y in constraints:
+            self.add_arc(x, y, relation)
+            self.add_arc(y, x, lambda a, b: relation(b, a))
+
+        self.nodes = 0
+
+    def add_arc(self, x, y, relation):
+        """
+        Constrain `x` by `y`, combining with any constraint between them
+        already indexed.
+        """
+        existing = self.neighbors[x].get(y)
+        if existing is None:
+            self.neighbors[x][y] = relation
+        else:
+            self.neighbors[x][y] = (
+                lambda a, b: existing(a, b) and relation(a, b)
+            )
+
+    def solve(self, inference="mac"):
+        """
+        Return a complete assignment satisfying every constraint, or None
+        if there is none, inferring with `inference` after each
+        assignment (one of INFERENCES).
+        """
+        if inference not in INFERENCES:
+            raise Exception(f"Unknown inference: {inference}")
+        self.inference = inference
+        self.nodes = 0
+        self.current = {
+            var: set(values) for var, values in self.domains.items()
+        }
+        self.trail = []
+        if inference == "mac" and not self.ac3():
+            return None
+        return self.backtrack(dict())
+
+    def backtrack(self, assignment):
+        """
+        Runs backtracking search to find an assignment. Rather than
+        recursing once per variable, each assigned variable is kept on a
+        stack with the values it has left to try and the trail mark to
+        undo to, so large problems do not run out of recursion depth.
+        """
+
+        # Check if assignment is complete
+        if len(assignment) == len(self.variables):
+            return assignment
+
+        # Try a new variable
+        var = self.select_unassigned_variable(assignment)
+        stack = [(var, iter(self.order_domain_values(var)), None)]
+        while stack:
+            var, values, mark = stack[-1]
+
+            # Undo the value tried last, if any
+            if mark is not None:
+                del assignment[var]
+                self.undo(mark)
+
+            # Find the next value that is consistent and infers no failure
+            for value in values:
+                self.nodes += 1
+                if not self.consistent(var, value, assignment):
+                    continue
+                mark = len(self.trail)
+                assignment[var] = value
+                if self.infer(var, value, assignment):
+                    break
+                del assignment[var]
+                self.undo(mark)
+
+            # Backtrack to the previous variable if no value is left
+            else:
+                stack.pop()
+                continue
+            stack[-1] = (var, values, mark)
+
+            # Check if assignment is complete, or try a new variable
+            if len(assignment) == len(self.variables):
+                return assignment
+            var = self.select_unassigned_variable(assignment)
+            stack.append((var, iter(self.order_domain_values(var)), None))
+        return None
+
+    def select_unassigned_variable(self, assignment):
+        """
+        Chooses an unassigned variable with the fewest values left,
+        breaking ties by the most unassigned neighbors.
+        """
+        return min(
+            (var for var in self.variables if var not in assignment),
+            key=lambda var: (
+                len(self.current[var]),
+                -sum(1 for y in self.neighbors[var] if y not in assignment)
+            )
+        )
+
+    def order_domain_values(self, var):
+        """Returns the values left for `var`, in their original order."""
+        return [
+            value for value in self.domains[var]
+            if value in self.current[var]
+        ]
+
+    def consistent(self, var, value, assignment):
+        """
+        Checks whether assigning `value` to `var` satisfies every
+        constraint with an assigned neighbor.
+        """
+        for y, relation in self.neighbors[var].items():
+            if y in assignment and not relation(value, assignment[y]):
+                return False
+        return True
+
+    def infer(self, var, value, assignment):
+        """
+        Reduce the domain of `var` to `value` and propagate, returning
+        False if some domain becomes empty.
+        """
+        for other in list(self.current[var]):
+            if other != value:
+                self.prune(var, other)
+        if self.inference == "forward":
+            return self.forward_check(var, assignment)
+        if self.inference == "mac":
+            return self.ac3([
+                (y, var) for y in self.neighbors[var] if y not in assignment
+            ])
+        return True
+
+    def forward_check(self, var, assignment):
+        """
+        Remove the values of unassigned neighbors of `var` that conflict
+        with its value, returning False if some domain becomes empty.
+        """
+        value = next(iter(self.current[var]))
+        for y, relation in self.neighbors[var].items():
+            if y in assignment:
+                continue
+            for other in list(self.current[y]):
+                if not relation(value, other):
+                    self.prune(y, other)
+            if not self.current[y]:
+                return False
+        return True
+
+    def revise(self, x, y):
+        """
+        Make `x` arc consistent with `y`, removing each value of `x` that
+        no value of `y` allows. Return True if a value was removed.
+        """
+        relation = self.neighbors[x][y]
+        revised = False
+        for value in list(self.current[x]):
+            if not any(relation(value, other) for other in self.current[y]):
+                self.prune(x, value)
+                revised = True
+        return revised
+
+    def ac3(self, arcs=None):
+        """
+        Enforce arc consistency on every arc in `arcs` (by default every
+        arc), and on the arcs into any domain that shrinks. Return False
+        if some domain becomes empty.
+        """
+        if arcs is None:
+            arcs = [(x, y) for x in self.variables for y in self.neighbors[x]]
+        queue = list(arcs)
+        while queue:
+            x, y = queue.pop()
+            if self.revise(x, y):
+                if not self.current[x]:
+                    return False
+                queue.extend((z, x) for z in self.neighbors[x] if z != y)
+        return True
+
+    def prune(self, var, value):
+        """Remove `value` from the domain of `var`, recording it to undo."""
+        self.current[var].remove(value)
+        self.trail.append((var, value))
+
+    def undo(self, mark):
+        """Restore every value pruned since the trail was `mark` long."""
+        while len(self.trail) > mark:
+            var, value = self.trail.pop()
+            self.current[var].add(value)
+
+
+def main():
+    if len(sys.argv) not in [1, 2]:
+        sys.exit("Usage: python csp.py [inference]")
+    inference = sys.argv[1] if len(sys.argv) == 2 else "mac"
+    if inference not in INFERENCES:
+        sys.exit(f"Inference must be one of {', '.join(INFERENCES)}")
+
+    csp = CSP(VARIABLES, ["Monday", "Tuesday", "Wednesday"], CONSTRAINTS)
+    print(csp.solve(inference))
+
+
+if __name__ == "__main__":
+    main()
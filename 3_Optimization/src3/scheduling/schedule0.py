@@ -61,5 +61,10 @@ def consistent(assignment):
     return True
 
 
-solution = backtrack(dict())
-print(solution)
+def main():
+    solution = backtrack(dict())
+    print(solution)
+
+
+if __name__ == "__main__":
+    main()
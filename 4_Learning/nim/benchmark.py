@@ -0,0 +1,75 @@
+import contextlib
+import functools
+import io
+import random
+import sys
+import time
+
+import nim
+import dense
+
+# Training games to time
+GAMES = 100000
+
+# Games to play against an optimal player after training
+EVALUATION = 1000
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit("Usage: python benchmark.py")
+
+    print(f"{GAMES} training games")
+    trainers = [("nim.train", nim.train), ("dense.train", dense.train)]
+    for name, train in trainers:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai = train(GAMES)
+        elapsed = time.perf_counter() - start
+        print(f"  {name}: {elapsed:.3f}s, "
+              f"won {win_rate(ai):.1%} against an optimal player")
+
+
+def optimal_action(piles):
+    """
+    Return an optimal action in `piles`, where the player who takes the
+    last object loses, or a random action if every action loses.
+    """
+    large = [pile for pile in piles if pile > 1]
+    if not large:
+        return next((i, 1) for i, pile in enumerate(piles) if pile)
+
+    # With one pile left over 1, leave an odd number of piles of 1
+    if len(large) == 1:
+        i = piles.index(large[0])
+        ones = sum(1 for pile in piles if pile == 1)
+        return (i, piles[i] - (1 if ones % 2 == 0 else 0))
+
+    # Otherwise leave piles whose XOR is 0
+    total = functools.reduce(lambda x, y: x ^ y, piles)
+    for i, pile in enumerate(piles):
+        if pile ^ total < pile:
+            return (i, pile - (pile ^ total))
+    return random.choice(sorted(nim.Nim.available_actions(piles)))
+
+
+def win_rate(ai):
+    """
+    Return the fraction of EVALUATION games `ai` wins against an optimal
+    player, moving first in half of them.
+    """
+    wins = 0
+    for i in range(EVALUATION):
+        game = nim.Nim()
+        player = i % 2
+        while game.winner is None:
+            if game.player == player:
+                game.move(ai.choose_action(game.piles, epsilon=False))
+            else:
+                game.move(optimal_action(game.piles))
+        wins += game.winner == player
+    return wins / EVALUATION
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import sys
+
+import numpy as np
+
+from nim import NimAI, play
+
+# Games played at once in each round of training
+BATCH = 256
+
+
+class DenseNimAI(NimAI):
+
+    def __init__(self, initial=[1, 3, 5, 7], alpha=0.5, epsilon=0.1,
+                 seed=None):
+        """
+        Initialize AI with a Q-table of zeros, an alpha (learning) rate,
+        and an epsilon rate, for games starting from piles `initial`.
+
+        The Q-table is a NumPy array with a row per state and a column per
+        action.
+         - A state's row is its piles read as a mixed-radix number, where
+           pile `i` is a digit in base `initial[i] + 1`
+         - Action `(i, j)` is column `offsets[i] + j - 1`
+        Which actions are legal in each state, and the state each leads
+        to, are precomputed.
+        """
+        self.initial = list(initial)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.random = np.random.default_rng(seed)
+
+        # Mixed-radix place value of each pile, and column of its actions
+        self.strides = np.cumprod([1] + [p + 1 for p in initial[:-1]])
+        self.offsets = np.cumsum([0] + list(initial[:-1]))
+        states = int(np.prod([p + 1 for p in initial]))
+        self.actions = [
+            (i, j) for i, pile in enumerate(initial)
+            for j in range(1, pile + 1)
+        ]
+
+        # Piles of every state, the actions legal in it and where they lead
+        index = np.arange(states)
+        piles = (index[:, None] // self.strides) % (np.array(initial) + 1)
+        pile = np.array([i for i, _ in self.actions])
+        count = np.array([j for _, j in self.actions])
+        self.legal = piles[:, pile] >= count
+        self.next = index[:, None] - self.strides[pile] * count
+        self.initial_state = self.encode(initial)
+
+        self.q = np.zeros((states, len(self.actions)))
+
+    def encode(self, state):
+        """Return the row of the Q-table for the piles `state`."""
+        return int(np.dot(state, self.strides))
+
+    def column(self, action):
+        """Return the column of the Q-table for the action `(i, j)`."""
+        i, j = action
+        return int(self.offsets[i]) + j - 1
+
+    def get_q_value(self, state, action):
+        """
+        Return the Q-value for the state `state` and the action `action`.
+        """
+        return self.q[self.encode(state), self.column(action)]
+
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Update the Q-value for the state `state` and the action `action`
+        given the previous Q-value `old_q`, a current reward `reward`,
+        and an estimate of future rewards `future_rewards`.
+        """
+        self.q[self.encode(state), self.column(action)] = (
+            old_q + self.alpha * ((reward + future_rewards) - old_q)
+        )
+
+    def best_future_reward(self, state):
+        """
+        Return the maximum Q-value of the actions legal in `state`,
+        or 0 if there are none.
+        """
+        s = self.encode(state)
+        if not self.legal[s].any():
+            return 0
+        return self.q[s, self.legal[s]].max()
+
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take: with
+        probability `self.epsilon` if `epsilon` is True a random legal
+        action, otherwise one of the legal actions with the highest
+        Q-value.
+        """
+        s = self.encode(state)
+        return self.actions[
+            self.choose(np.array([s]), epsilon)[0]
+        ]
+
+    def choose(self, states, epsilon=True):
+        """
+        Return the column of an action for each row of the Q-table in
+        `states`, chosen as by `choose_action`, breaking ties at random.
+        """
+        legal = self.legal[states]
+        noise = self.random.random(legal.shape)
+
+        # Best legal actions, breaking ties with the noise
+        q = np.where(legal, self.q[states], -np.inf)
+        best = q == q.max(axis=1, keepdims=True)
+        choices = np.argmax(np.where(best, noise, -1), axis=1)
+
+        # Random legal actions, with probability epsilon
+        if epsilon:
+            explore = self.random.random(len(states)) < self.epsilon
+            explored = np.argmax(np.where(legal, noise, -1), axis=1)
+            choices = np.where(explore, explored, choices)
+        return choices
+
+    def learn(self, states, actions, new_states, rewards):
+        """
+        Update the Q-values of every `(state, action)` pair given by rows
+        of `states` and columns of `actions`, leading to rows
+        `new_states` with rewards `rewards`, all at once.
+
+        Every update is computed from the Q-table as it was before any of
+        them. A pair that appears more than once moves by the average of
+        its updates, so none are lost and none are applied twice over.
+        """
+        legal = self.legal[new_states]
+        future = np.where(legal, self.q[new_states], -np.inf).max(axis=1)
+        future = np.where(legal.any(axis=1), future, 0)
+        cells = states * self.q.shape[1] + actions
+        errors = (rewards + future) - self.q.flat[cells]
+        totals = np.bincount(cells, weights=errors, minlength=self.q.size)
+        counts = np.bincount(cells, minlength=self.q.size)
+        updated = counts > 0
+        self.q.flat[updated] += (
+            self.alpha * totals[updated] / counts[updated]
+        )
+
+
+def train(n, initial=[1, 3, 5, 7], batch=BATCH, seed=None):
+    """
+    Train an AI by playing `n` games against itself, `batch` games at a
+    time in lockstep. Every game in a batch makes its move, then all of
+    their updates are made at once from the same Q-table (see `learn`).
+
+    Even with a batch of 1 this does not learn exactly as `nim.train`
+    does: the future reward is the true maximum Q-value of the legal
+    actions, where `NimAI.best_future_reward` never returns less than 0,
+    and ties between best actions are broken at random rather than by
+    the order of `Nim.available_actions`.
+    """
+    player = DenseNimAI(initial, seed=seed)
+    rows = np.arange(batch)
+
+    for start in range(0, n, batch):
+        games = min(batch, n - start)
+        states = np.full(games, player.initial_state)
+        active = rows[:games]
+
+        # Last row and column played by each player in each game
+        last_state = np.full((2, games), -1)
+        last_action = np.full((2, games), -1)
+        turn = 0
+
+        while len(active):
+            s = states[active]
+            actions = player.choose(s)
+            new_states = player.next[s, actions]
+            last_state[turn, active] = s
+            last_action[turn, active] = actions
+
+            # The player who takes the last object loses, and the other
+            # wins; otherwise the other player's last move leads here
+            over = new_states == 0
+            other = 1 - turn
+            moved = last_state[other, active] >= 0
+            winning = over & moved
+            waiting = ~over & moved
+            winners = active[winning]
+            continuing = active[waiting]
+            player.learn(
+                np.concatenate([
+                    s[over], last_state[other, winners],
+                    last_state[other, continuing]
+                ]),
+                np.concatenate([
+                    actions[over], last_action[other, winners],
+                    last_action[other, continuing]
+                ]),
+                np.concatenate([
+                    new_states[over], new_states[winning],
+                    new_states[waiting]
+                ]),
+                np.concatenate([
+                    np.full(over.sum(), -1), np.full(len(winners), 1),
+                    np.zeros(len(continuing))
+                ])
+            )
+
+            states[active] = new_states
+            active = active[~over]
+            turn = other
+
+    return player
+
+
+def main():
+    if len(sys.argv) not in [1, 2]:
+        sys.exit("Usage: python dense.py [games]")
+    n = int(sys.argv[1]) if len(sys.argv) == 2 else 100000
+    ai = train(n)
+    print("Done training")
+    play(ai)
+
+
+if __name__ == "__main__":
+    main()
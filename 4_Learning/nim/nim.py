@@ -123,8 +123,6 @@ class NimAI():
         """
         s = tuple(state)
         a = action
-        print(reward)
-        print(future_rewards)
         self.q[s, a] = old_q + self.alpha * ((reward + future_rewards) - old_q)
 
     def best_future_reward(self, state):